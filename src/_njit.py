@@ -0,0 +1,32 @@
+"""
+Optional Numba support.
+
+Kernels are decorated with `njit` from this module so they still run
+(as plain Python) when numba isn't installed.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """ No-op stand-in for numba.njit """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def signatures(ret: str, args: str) -> list:
+    """
+    Numba signature strings for `ret(args)`, one per layout of its float64[:]
+    arguments: C-contiguous, any layout, and read-only (pandas can hand out
+    read-only views of its columns). Each input array then matches exactly
+    one signature.
+
+    Passing the list to njit compiles the kernel eagerly at import time
+    instead of on its first call.
+    """
+    contiguous_args = args.replace("float64[:]", "float64[::1]")
+    readonly_args = args.replace("float64[:]", "Array(float64, 1, 'A', readonly=True)")
+    return [f"{ret}({contiguous_args})", f"{ret}({args})", f"{ret}({readonly_args})"]
@@ -1,30 +1,79 @@
 from alpaca.trading.client import TradingClient
 from alpaca.data.historical import StockHistoricalDataClient
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 import os
 
+# Parse .env once per process rather than on every client instantiation
+load_dotenv()
+
+@dataclass(frozen = True)
+class AlpacaCredentials:
+    """ Alpaca API credentials read from the environment. """
+    api_key: Optional[str]
+    secret_key: Optional[str]
+    base_url: Optional[str]
+
+@lru_cache(maxsize = None)
+def load_credentials(profile: str = "") -> AlpacaCredentials:
+    """
+    Read credentials for a profile from the environment (memoized).
+
+    The default profile reads ALPACA_API_KEY / ALPACA_API_SECRET / ALPACA_BASE_URL.
+    A named profile, e.g. "live", reads ALPACA_LIVE_API_KEY, etc.
+    """
+    prefix = f"ALPACA_{profile.upper()}_" if profile else "ALPACA_"
+    return AlpacaCredentials(
+        api_key = os.getenv(f"{prefix}API_KEY"),
+        secret_key = os.getenv(f"{prefix}API_SECRET"),
+        base_url = os.getenv(f"{prefix}BASE_URL"),
+    )
+
+# Keep-alive pool per host; sized for the concurrent bar fetches and order polling
+HTTP_POOL_SIZE = 20
+
+def pool_connections(rest_client):
+    """
+    Mount a larger keep-alive connection pool on an alpaca-py REST client's session.
+
+    alpaca-py issues every call through one requests.Session; with the default
+    pool of 10, concurrent callers beyond that open and drop extra connections,
+    paying a TCP + TLS handshake each time.
+    """
+    adapter = HTTPAdapter(pool_connections = HTTP_POOL_SIZE, pool_maxsize = HTTP_POOL_SIZE)
+    rest_client._session.mount("https://", adapter)
+    return rest_client
+
 class AlpacaClient:
     """ Handles direct connection and low-level operations with Alpaca's API. """
 
-    def __init__(self, paper: bool = True):
-        load_dotenv()
-        self.api_key = os.getenv("ALPACA_API_KEY")
-        self.secret_key = os.getenv("ALPACA_API_SECRET")
-        self.base_url = os.getenv("ALPACA_BASE_URL")
+    def __init__(self, paper: bool = True, credentials: Optional[AlpacaCredentials] = None):
+        credentials = credentials or load_credentials()
+        self.api_key = credentials.api_key
+        self.secret_key = credentials.secret_key
+        self.base_url = credentials.base_url
 
         if not all([self.api_key, self.secret_key, self.base_url]):
             raise ValueError("Missing one or more Alpaca environment variables!")
-        
-        self.trading = TradingClient(self.api_key, self.secret_key, paper = paper)
-        self.data = StockHistoricalDataClient(self.api_key, self.secret_key)
-    
+
+        self.trading = pool_connections(TradingClient(self.api_key, self.secret_key, paper = paper))
+        self.data = pool_connections(StockHistoricalDataClient(self.api_key, self.secret_key))
+
+    @classmethod
+    def from_env(cls, profile: str, paper: bool = True) -> "AlpacaClient":
+        """ Create a client for a named credential profile (see load_credentials). """
+        return cls(paper = paper, credentials = load_credentials(profile))
+
     def get_account(self):
         """ Return account details (direct from Alpaca). """
         return self.trading.get_account()
-    
+
     def get_positions(self):
         return self.trading.get_all_positions()
-    
+
     def raw_submit_order(self, order_request):
         """ Submit a raw order request (used by higher broker layer). """
         return self.trading.submit_order(order_request)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import numpy as np
+from src._njit import njit
+from src.strategies.signal import BUY, SELL
+
+
+@njit(cache = True)
+def run_backtest(
+        closes,
+        signals,
+        start,
+        cash,
+        risk_per_trade,
+        slippage_pct,
+        commission_fixed,
+        commission_pct,
+):
+    """
+    Bar-by-bar buy/sell/accounting loop over precomputed signals.
+
+    Args:
+        closes: float64 array of close prices
+        signals: int8 array of signal codes (HOLD / BUY / SELL)
+        start: First bar to trade on (warmup bars are skipped)
+        cash: Starting cash
+        commission_fixed, commission_pct: Fee per fill is notional * commission_pct
+            + commission_fixed; callers zero whichever one does not apply
+
+    Returns:
+        Tuple of (equity, entry_idx, exit_idx, entry_px, exit_px, qty, pnl,
+        commission, cash, position_qty, entry_price, entry_i). Trade arrays
+        only contain closed trades; the last four values describe the state
+        at the final bar so the caller can close any open position.
+    """
+    n = closes.shape[0]
+    max_trades = n // 2 + 1
+
+    equity = np.empty(n, dtype = np.float64)
+    equity[:start] = cash
+    entry_idx = np.empty(max_trades, dtype = np.int64)
+    exit_idx = np.empty(max_trades, dtype = np.int64)
+    entry_px = np.empty(max_trades, dtype = np.float64)
+    exit_px = np.empty(max_trades, dtype = np.float64)
+    qty_arr = np.empty(max_trades, dtype = np.float64)
+    pnl_arr = np.empty(max_trades, dtype = np.float64)
+    commission_arr = np.empty(max_trades, dtype = np.float64)
+
+    position_qty = 0.0
+    entry_price = 0.0
+    entry_i = -1
+    n_trades = 0
+
+    for i in range(start, n):
+        price = closes[i]
+        signal = signals[i]
+
+        if signal == BUY and position_qty == 0.0:
+            qty = (cash * risk_per_trade) / price
+            # Apply slippage
+            slip_price = price * (1 + slippage_pct)
+            # Commission
+            notional = qty * slip_price
+            commission = notional * commission_pct + commission_fixed
+
+            total_cost = notional + commission
+            if total_cost > cash:
+                qty *= cash / total_cost
+                notional = qty * slip_price
+                total_cost = notional + commission
+
+            cash -= total_cost
+            position_qty = qty
+            entry_price = slip_price
+            entry_i = i
+
+        elif signal == SELL and position_qty > 0.0:
+            slip_price = price * (1 - slippage_pct)
+            notional = position_qty * slip_price
+            commission = notional * commission_pct + commission_fixed
+
+            cash += notional - commission
+            entry_idx[n_trades] = entry_i
+            exit_idx[n_trades] = i
+            entry_px[n_trades] = entry_price
+            exit_px[n_trades] = slip_price
+            qty_arr[n_trades] = position_qty
+            pnl_arr[n_trades] = (slip_price - entry_price) * position_qty - commission
+            commission_arr[n_trades] = commission
+            n_trades += 1
+
+            position_qty = 0.0
+            entry_price = 0.0
+            entry_i = -1
+
+        equity[i] = cash + position_qty * price
+
+    return (
+        equity,
+        entry_idx[:n_trades],
+        exit_idx[:n_trades],
+        entry_px[:n_trades],
+        exit_px[:n_trades],
+        qty_arr[:n_trades],
+        pnl_arr[:n_trades],
+        commission_arr[:n_trades],
+        cash,
+        position_qty,
+        entry_price,
+        entry_i,
+    )
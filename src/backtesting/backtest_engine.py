@@ -1,8 +1,7 @@
-from typing import Optional
-from pathlib import Path
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from typing import Optional, List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
 
 from src.strategies.base_strategy import BaseStrategy
 from src.portfolio.position_manager import PositionManager
@@ -10,6 +9,7 @@ from src.portfolio.risk_config import RiskConfig
 from src.brokers.base_broker import BaseBroker
 from src.data.base_data_provider import BaseDataProvider
 from src.backtesting.backtest_result import BacktestResult
+from src.backtesting._kernels import run_backtest
 
 class BacktestEngine:
     """
@@ -62,113 +62,183 @@ class BacktestEngine:
         )
         if bars is None or bars.empty:
             print("No historical bars found.")
-            return BacktestResult(symbol, self.starting_cash, [], 0, [])
-    
+            return self._empty_result(symbol)
+
+        closes, timestamps, kernel_args = self._prepare(symbol, bars)
+        result = self._build_result(symbol, closes, timestamps, run_backtest(*kernel_args))
+
+        print(f"\n--- Backtest Complete ---")
+        result.print_summary()
+        return result
+
+    def run_many(
+            self,
+            symbols: List[str],
+            days_back: int = 365,
+            timeframe: str = "1Day",
+            limit: int = 1000,
+            max_workers: Optional[int] = None,
+    ) -> Dict[str, BacktestResult]:
+        """
+        Run the same backtest over several symbols in parallel.
+
+        Bars are fetched with the provider's get_bars_multi (a single request where
+        the provider supports it), signals are computed here, and the accounting loop
+        for each symbol runs on a process pool over plain numpy arrays. Scripts calling
+        this must guard their entry point with `if __name__ == "__main__":` so worker
+        processes can be spawned safely.
+
+        Args:
+            symbols: Symbols to backtest.
+            days_back, timeframe, limit: Passed through to the data provider.
+            max_workers: Process pool size (defaults to the executor's own).
+
+        Returns:
+            Dict mapping each symbol to its BacktestResult, in input order.
+        """
+        print(f"\n=== Backtest Start: {', '.join(symbols)} | {days_back} days @ {timeframe} ===")
+
+        all_bars = self.data_provider.get_bars_multi(
+            symbols, timeframe = timeframe, limit = limit, days_back = days_back
+        )
+
+        results = {}
+        prepared = {}
+        for symbol in symbols:
+            bars = all_bars.get(symbol)
+            if bars is None or bars.empty:
+                print(f"No historical bars found for {symbol}.")
+                results[symbol] = self._empty_result(symbol)
+            else:
+                prepared[symbol] = self._prepare(symbol, bars)
+
+        with ProcessPoolExecutor(max_workers = max_workers) as pool:
+            futures = {
+                symbol: pool.submit(_run_kernel, kernel_args)
+                for symbol, (_, _, kernel_args) in prepared.items()
+            }
+            for symbol, future in futures.items():
+                closes, timestamps, _ = prepared[symbol]
+                results[symbol] = self._build_result(symbol, closes, timestamps, future.result())
+
+        print(f"\n--- Backtest Complete ---")
+        for symbol in symbols:
+            results[symbol].print_summary()
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def _empty_result(self, symbol: str) -> BacktestResult:
+        """ Result for a symbol with no historical bars. """
+        return BacktestResult(
+            symbol, self.starting_cash, [], 0, np.empty(0), self.strategy.__class__.__name__
+        )
+
+    def _commission_rates(self, symbol: str) -> Tuple[float, float]:
+        """
+        Resolve (fixed, pct) commission for a symbol so every fill uses one formula:
+        notional * pct + fixed. Crypto pays the percentage fee, stocks the fixed fee.
+        """
+        if ("USD" in symbol) or ("/" in symbol):
+            return 0.0, float(self.commission_crypto_pct)
+        return float(self.commission_stock_fixed), 0.0
+
+    def _prepare(self, symbol: str, bars: pd.DataFrame) -> Tuple:
+        """ Sort bars, compute signals and pack the arguments for the compiled loop. """
         bars = bars.sort_index()
-        cash = self.starting_cash
-        position_qty = 0.0
-        trades = []
-        equity_curve = []
-
-        for i in range(20, len(bars)):
-            window = bars.iloc[: i + 1].copy()
-            signal = self.strategy.evaluate_signal(window)
-            price = window["close"].iloc[-1]
-
-            if signal == "buy" and position_qty == 0:
-                qty = (cash * self.position_manager.config.risk_per_trade) / price
-                # Apply slippage
-                slip_price = price * (1 + self.slippage_pct)
-                # Commission
-                notional = qty * slip_price
-                if "USD" in symbol or "/" in symbol:
-                    commission = notional * self.commission_crypto_pct
-                else:
-                    commission = self.commission_stock_fixed
-                
-                total_cost = notional + commission
-                if total_cost > cash:
-                    qty *= cash / total_cost
-                    notional = qty * slip_price
-                    total_cost = notional + commission
-                
-                cash -= total_cost
-                position_qty = qty
-                self.entry_price = slip_price
-                self.entry_time = bars.index[i]
-                if self.verbose:
-                    print(f"[BUY] {symbol} x{qty:.3f} @ {price:.4f}")
-            
-            elif signal == "sell" and position_qty > 0:
-                slip_price = price * (1 - self.slippage_pct)
-                notional = position_qty * slip_price
-
-                if "USD" in symbol or "/" in symbol:
-                    commission = notional * self.commission_crypto_pct
-                else:
-                    commission = self.commission_stock_fixed
-                
-                cash += notional - commission
-                pnl = (slip_price - self.entry_price) * position_qty - commission
-                trades.append(
-                    {
-                        "symbol": symbol,
-                        "entry_price": self.entry_price,
-                        "exit_price": slip_price,
-                        "qty": position_qty,
-                        "pnl": pnl,
-                        "entry_time": self.entry_time,
-                        "exit_time": bars.index[i],
-                        "commission": commission,
-                        "slippage": self.slippage_pct
-                    }
-                )
-
-                position_qty = 0
-                self.entry_price = None
-                self.entry_time = None
-
-            total_equity = cash + position_qty * price
-            equity_curve.append({"equity": total_equity})
+
+        # Materialize closes and timestamps once; strategies index into them instead of
+        # receiving a fresh copy of the growing window every bar. Closes are coerced to a
+        # contiguous float64 array even when Alpaca hands back object/nullable dtypes
+        closes = np.ascontiguousarray(bars["close"].to_numpy(dtype = np.float64))
+        timestamps = bars.index.to_numpy(dtype = object)
+
+        # One call for the whole series instead of re-evaluating the history each bar
+        signals = self.strategy.compute_signals(bars, start = 20)
+
+        # Loop-invariant settings, resolved once per run
+        kernel_args = (
+            closes,
+            signals,
+            20,
+            float(self.starting_cash),
+            float(self.position_manager.config.risk_per_trade),
+            float(self.slippage_pct),
+            *self._commission_rates(symbol),
+        )
+        return closes, timestamps, kernel_args
+
+    def _build_result(
+            self,
+            symbol: str,
+            closes: np.ndarray,
+            timestamps: np.ndarray,
+            kernel_out: Tuple,
+    ) -> BacktestResult:
+        """ Turn the compiled loop's output into a BacktestResult, closing any open position. """
+        (
+            equity, entry_idx, exit_idx, entry_px, exit_px, qty_arr, pnl_arr, commission_arr,
+            cash, position_qty, entry_price, entry_i,
+        ) = kernel_out
+        slip = float(self.slippage_pct)
+        comm_fixed, comm_pct = self._commission_rates(symbol)
+
+        if self.verbose:
+            for k in range(len(pnl_arr)):
+                print(f"[BUY] {symbol} x{qty_arr[k]:.3f} @ {closes[entry_idx[k]]:.4f}")
+
+        # Trades are kept column-wise, one array per field
+        trades = {
+            "symbol": np.full(len(pnl_arr), symbol, dtype = object),
+            "entry_price": entry_px,
+            "exit_price": exit_px,
+            "qty": qty_arr,
+            "pnl": pnl_arr,
+            "entry_time": timestamps[entry_idx],
+            "exit_time": timestamps[exit_idx],
+            "commission": commission_arr,
+            "slippage": np.full(len(pnl_arr), slip),
+        }
+
+        if entry_i >= 0:
+            self.entry_price = entry_price
+            self.entry_time = timestamps[entry_i]
+            if self.verbose:
+                print(f"[BUY] {symbol} x{position_qty:.3f} @ {closes[entry_i]:.4f}")
 
         if position_qty > 0 and self.entry_price is not None:
-            final_price = bars['close'].iloc[-1]
+            final_price = closes[-1]
             # Apply slippage
-            exit_price = final_price * (1 - self.slippage_pct)
+            exit_price = final_price * (1 - slip)
             # Notional
             notional = position_qty * exit_price
-            if "USD" in symbol or "/" in symbol:
-                commission = notional * self.commission_crypto_pct
-            else:
-                commission = self.commission_stock_fixed
+            commission = notional * comm_pct + comm_fixed
 
             cash += notional - commission
             pnl = (exit_price - self.entry_price) * position_qty - commission
-            trades.append(
-                {
-                    "symbol": symbol,
-                    "entry_price": self.entry_price,
-                    "exit_price": final_price,
-                    "qty": position_qty,
-                    "pnl": pnl,
-                    "entry_time": self.entry_time,
-                    "exit_time": bars.index[-1],
-                    "commission": commission,
-                    "slippage": self.slippage_pct
-                }
-            )
+            final_trade = {
+                "symbol": symbol,
+                "entry_price": self.entry_price,
+                "exit_price": final_price,
+                "qty": position_qty,
+                "pnl": pnl,
+                "entry_time": self.entry_time,
+                "exit_time": timestamps[-1],
+                "commission": commission,
+                "slippage": slip
+            }
+            trades = {key: np.append(col, final_trade[key]) for key, col in trades.items()}
             if self.verbose:
                 print(f"[FINAL CLOSE] {symbol} @ {exit_price:.4f} | P&L = {pnl:.4f}")
         
-        result = BacktestResult(
+        return BacktestResult.from_arrays(
             symbol = symbol,
             starting_cash = self.starting_cash,
+            equity = equity,
             trades = trades,
-            bars_processed = len(bars),
-            equity_curve = equity_curve,
-            strategy_name = self.strategy.__class__.__name__
+            strategy_name = self.strategy.__class__.__name__,
+            ts = timestamps,
         )
 
-        print(f"\n--- Backtest Complete ---")
-        result.print_summary()
-        return result
\ No newline at end of file
+
+def _run_kernel(kernel_args: Tuple) -> Tuple:
+    """ Process-pool entry point; module-level so it can be pickled. """
+    return run_backtest(*kernel_args)
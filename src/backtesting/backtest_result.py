@@ -1,93 +1,224 @@
-from typing import List, Dict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import List, Dict, Optional, Union
+import numpy as np
 import pandas as pd
-import os
+from pathlib import Path
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+# Rows per chunk when streaming CSV exports through pandas
+_CSV_CHUNKSIZE = 65536
+
+
+def _ensure_parent(path: str):
+    """ Create the parent directory of path if it doesn't exist yet """
+    parent = Path(path).parent
+    if not parent.exists():
+        parent.mkdir(parents = True, exist_ok = True)
+
+
+def _write_csv(df: pd.DataFrame, path: str):
+    """
+    Write a frame to CSV with pyarrow's C++ writer when available,
+    falling back to chunked pandas output. Values keep full precision.
+    """
+    if pa_csv is not None:
+        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index = False), path)
+    else:
+        df.to_csv(path, index = False, chunksize = _CSV_CHUNKSIZE)
+
+
+@lru_cache(maxsize = None)
+def _save_figure() -> Figure:
+    """ Off-screen figure shared by plot_equity calls that only save to disk """
+    return Figure(figsize=(10, 4))
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    """ Read-only view of an array (the caller's array keeps its own flags) """
+    view = np.asarray(arr).view()
+    view.flags.writeable = False
+    return view
+
+
+@dataclass(frozen = True)
+class EquityCurve:
+    """ Equity curve stored column-wise: one equity value (and timestamp) per bar """
+    equity: np.ndarray
+    ts: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.equity)
+
 
 class BacktestResult:
-    """ Stores and calculates backtest results and metrics """
+    """
+    Stores and calculates backtest results and metrics
+
+    Do not construct intermediate DataFrames from `.trades` inside a loop;
+    use `.trades_df` once after `run()` completes. Metrics are computed
+    lazily on first access and cached for the lifetime of the result, so the
+    stored trade and equity arrays are read-only.
+    """
 
     def __init__(
             self,
             symbol: str,
             starting_cash: float,
-            trades: List[Dict],
+            trades: Union[Dict[str, np.ndarray], List[Dict]],
             bars_processed: int,
-            equity_curve: List[Dict],
+            equity_curve: Union[EquityCurve, np.ndarray, List[Dict]],
             strategy_name: str
     ):
         self.symbol = symbol
         self.starting_cash = starting_cash
-        self.trades = trades
         self.bars_processed = bars_processed
-        self.equity_curve = equity_curve
         self.strategy_name = strategy_name
+
+        # Equity is stored as an EquityCurve of flat arrays; bare arrays and
+        # list-of-dicts input are still accepted and converted once here
+        if isinstance(equity_curve, EquityCurve):
+            equity, ts = equity_curve.equity, equity_curve.ts
+        elif isinstance(equity_curve, np.ndarray):
+            equity, ts = equity_curve, None
+        else:
+            equity, ts = np.fromiter(
+                (e["equity"] for e in equity_curve), dtype = np.float64, count = len(equity_curve)
+            ), None
+        self.equity_curve = EquityCurve(
+            _read_only(equity.astype(np.float64, copy = False)),
+            None if ts is None else _read_only(ts),
+        )
+
+        # Trades are stored column-wise (one array per field); a list of
+        # per-trade dicts is still accepted and converted once here
+        if isinstance(trades, dict):
+            self._trade_cols = {key: _read_only(col) for key, col in trades.items()}
+        elif trades:
+            self._trade_cols = {key: _read_only([t[key] for t in trades]) for key in trades[0]}
+        else:
+            self._trade_cols = {}
+
+        # Every metric below is derived from the P&L and commission columns,
+        # converted to float64 arrays once here
+        self._pnl = np.asarray(self._trade_cols.get("pnl", ()), dtype = np.float64)
+        self._commission = np.asarray(self._trade_cols.get("commission", ()), dtype = np.float64)
+        self._wins_mask = self._pnl > 0
+        self._losses_mask = self._pnl < 0
     
+    @classmethod
+    def from_arrays(
+            cls,
+            symbol: str,
+            starting_cash: float,
+            equity: np.ndarray,
+            trades: Dict[str, np.ndarray],
+            strategy_name: str,
+            ts: Optional[np.ndarray] = None,
+    ) -> "BacktestResult":
+        """
+        Wrap the arrays produced by the compiled backtest loop without any per-row conversion.
+
+        Args:
+            equity: float64 equity value per bar
+            trades: Trade columns, one array per field ("pnl", "commission", ...)
+            ts: Optional bar timestamps aligned with equity
+        """
+        return cls(
+            symbol = symbol,
+            starting_cash = starting_cash,
+            trades = trades,
+            bars_processed = len(equity),
+            equity_curve = EquityCurve(equity, ts),
+            strategy_name = strategy_name,
+        )
+
+    @cached_property
+    def _equity(self) -> np.ndarray:
+        """ Equity as a flat float64 array, shared by max_drawdown, plot_equity and to_csv """
+        return self.equity_curve.equity
+
     @property
+    def trades(self) -> List[Dict]:
+        """ Trades as a list of per-trade dicts (built from the stored columns) """
+        cols = self._trade_cols
+        return [dict(zip(cols, row)) for row in zip(*cols.values())]
+    
+    @cached_property
+    def trades_df(self) -> pd.DataFrame:
+        """ Trades as a DataFrame, one column per field (built once, then cached) """
+        return pd.DataFrame(self._trade_cols)
+    
+    @cached_property
     def total_trades(self) -> int:
-        return len(self.trades)
+        return int(self._pnl.size)
     
-    @property
+    @cached_property
     def total_pnl(self) -> float:
-        return sum(t["pnl"] for t in self.trades) if self.trades else 0.0
+        return float(self._pnl.sum())
     
-    @property
+    @cached_property
     def total_commission(self) -> float:
         """ Sum of all commission entries """
-        return sum(t.get("commission", 0.0) for t in self.trades)
+        return float(self._commission.sum())
     
-    @property
+    @cached_property
     def win_rate(self) -> float:
-        if not self.trades:
+        if self._pnl.size == 0:
             return 0.0
-        wins = len([t for t in self.trades if t['pnl'] > 0])
-        return wins / len(self.trades)
+        return self.num_wins / self._pnl.size
     
-    @property
+    @cached_property
     def num_wins(self) -> int:
-        return len([t for t in self.trades if t['pnl'] > 0])
+        return int(np.count_nonzero(self._wins_mask))
     
-    @property
+    @cached_property
     def num_losses(self) -> int:
-        return len([t for t in self.trades if t['pnl'] < 0])
+        return int(np.count_nonzero(self._losses_mask))
     
-    @property
+    @cached_property
     def avg_win(self) -> float:
-        wins = [t['pnl'] for t in self.trades if t['pnl'] > 0]
-        return sum(wins) / len(wins) if wins else 0.0
+        return float(self._pnl[self._wins_mask].mean()) if self._wins_mask.any() else 0.0
     
-    @property
+    @cached_property
     def avg_loss(self) -> float:
-        losses = [t['pnl'] for t in self.trades if t['pnl'] < 0]
-        return sum(losses) / len(losses) if losses else 0.0
+        return float(self._pnl[self._losses_mask].mean()) if self._losses_mask.any() else 0.0
     
-    @property
+    @cached_property
     def return_pct(self) -> float:
         """ Return as percentage of starting capital """
         return (self.total_pnl / self.starting_cash) * 100
     
-    @property
+    @cached_property
     def max_drawdown(self) -> float:
         """
         Calculate maximum drawdown as percentage.
         Drawdown = (Peak - Trough) / Peak
         """
-        if not self.equity_curve:
+        if self._equity.size == 0:
             return 0.0
         
-        equity_values = [e["equity"] for e in self.equity_curve]
-        peak = equity_values[0]
-        max_dd = 0.0
-
-        for equity in equity_values:
-            if equity > peak:
-                peak = equity
-            drawdown = (peak - equity) / peak
-            max_dd = max(max_dd, drawdown)
-        
-        return max_dd
+        eq = self._equity
+        peak = np.maximum.accumulate(eq)
+        # Non-positive peaks (blown-up account) count as zero drawdown instead of dividing by zero
+        dd = np.divide(peak - eq, peak, out = np.zeros_like(eq), where = peak > 0)
+        return float(dd.max())
     
     def summary(self) -> Dict:
         """ Return all metrics as a dictionary """
+        # strategy_name is read fresh since callers may relabel a result after run()
+        return {**self._metrics, "strategy": self.strategy_name}
+
+    @cached_property
+    def _metrics(self) -> Dict:
+        """ Metric values for summary(), computed once """
         return {
             "symbol": self.symbol,
             "bars_processed": self.bars_processed,
@@ -101,7 +232,6 @@ class BacktestResult:
             "avg_loss": self.avg_loss,
             "max_drawdown": self.max_drawdown,
             "total_commission": self.total_commission,
-            "strategy": self.strategy_name,
         }
     
     def print_summary(self):
@@ -122,33 +252,59 @@ class BacktestResult:
     
     def plot_equity(self, save_path: str = None):
         """ Quick matplotlib plot for equity curve """
-        if not self.equity_curve:
+        if self._equity.size == 0:
             print("No equity data to plot.")
             return
         
-        eq = [e["equity"] for e in self.equity_curve]
-        plt.figure(figsize=(10, 4))
-        plt.plot(eq, label=f"{self.symbol} Equity", color="tab:blue")
-        plt.title(f"Equity Curve - {self.symbol}")
-        plt.xlabel("Bars")
-        plt.ylabel("Equity ($)")
-        plt.grid(True)
-        plt.legend()
-        plt.tight_layout()
+        eq = self._equity
+
+        if save_path:
+            # Saving goes through a reused off-screen Figure, so no GUI backend is loaded
+            fig = _save_figure()
+            fig.clear()
+            ax = fig.add_subplot()
+        else:
+            fig, ax = plt.subplots(figsize=(10, 4))
+
+        ax.plot(eq, label=f"{self.symbol} Equity", color="tab:blue")
+        ax.set_title(f"Equity Curve - {self.symbol}")
+        ax.set_xlabel("Bars")
+        ax.set_ylabel("Equity ($)")
+        ax.grid(True)
+        ax.legend()
+        fig.tight_layout()
 
         if save_path:
-            plt.savefig(save_path, dpi=150)
+            fig.savefig(save_path, dpi=150)
             print(f"Saved equity curve to {save_path}")
         else:
             plt.show()
     
+    def _equity_df(self) -> pd.DataFrame:
+        """ Equity curve as a two-column (ts, equity) frame built from the stored arrays """
+        ec = self.equity_curve
+        return pd.DataFrame({"equity": self._equity} if ec.ts is None else {"ts": ec.ts, "equity": self._equity})
+
     def to_csv(self, path: str):
-        """ Save equity curve and trade summary to CSV. """
-        os.makedirs(os.path.dirname(path), exist_ok = True)
-        eq_df = pd.DataFrame(self.equity_curve)
-        eq_df.to_csv(path, index=False)
+        """ Save equity curve, trade log and trade summary to CSV. """
+        _ensure_parent(path)
+        _write_csv(self._equity_df(), path)
         print(F"Equity curve data saved -> {path}")
 
+        trades_path = path.replace(".csv", "_trades.csv")
+        _write_csv(self.trades_df, trades_path)
+        print(f"Trade log saved -> {trades_path}")
+
         summ_path = path.replace(".csv", "_summary.csv")
         pd.DataFrame([self.summary()]).to_csv(summ_path, index = False)
-        print(f"Summary metrics saved -> {summ_path}")
\ No newline at end of file
+        print(f"Summary metrics saved -> {summ_path}")
+
+    def to_parquet(self, path: str):
+        """ Save equity curve and trade log as LZ4-compressed parquet (columnar, much smaller than CSV). """
+        _ensure_parent(path)
+        self._equity_df().to_parquet(path, index = False, compression = "lz4")
+        print(f"Equity curve data saved -> {path}")
+
+        trades_path = path.replace(".parquet", "_trades.parquet")
+        self.trades_df.to_parquet(trades_path, index = False, compression = "lz4")
+        print(f"Trade log saved -> {trades_path}")
@@ -1,77 +1,129 @@
+from operator import attrgetter
+from typing import NamedTuple, Optional
+import threading
 import time
+import numpy as np
 from alpaca.trading.requests import MarketOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce, OrderStatus
 from alpaca.trading.models import Order
+from alpaca.trading.stream import TradingStream
 from src.brokers.base_broker import BaseBroker
 from src.alpaca_client import AlpacaClient
 
+class SymbolMeta(NamedTuple):
+    """ Per-symbol order metadata, derived once from the symbol string. """
+    raw: str
+    normalized: str
+    is_crypto: bool
+    tif: TimeInForce
+
+
+_POSITION_FIELDS = attrgetter("symbol", "qty", "market_value", "unrealized_pl")
+_ACCOUNT_FIELDS = attrgetter("id", "status", "cash", "portfolio_value")
+
 
 class AlpacaBroker(BaseBroker):
     """Implements the BaseBroker interface for Alpaca via alpaca-py."""
 
+    # Seconds a fetched account summary is reused for
+    ACCOUNT_SUMMARY_TTL = 1.0
+
     def __init__(self, paper: bool = True):
         self.client = AlpacaClient(paper=paper)
+        self.paper = paper
         self._position_before_order = {}
 
-    def _normalize_symbol(self, symbol: str) -> str:
+        # Position qty by symbol, refreshed from the API only after fills
+        self._positions_by_symbol = {}
+        self._positions_stale = True
+
+        self._account_summary = None
+        self._account_summary_at = 0.0
+
+        # Fill notifications from the trade-updates websocket, keyed by order id.
+        # The stream is started on the first order so backtests never open it
+        self._stream = None
+        self._fill_lock = threading.Lock()
+        self._fill_events = {}
+        self._filled_orders = {}
+
+        self._sym_meta = {}
+
+    def _meta(self, symbol: str) -> SymbolMeta:
         """
-        Normalize symbol for trading API
+        Symbol metadata, built on first use and cached per symbol.
 
-        Converts "XRP/USD" -> "XRPUSD" for crypto trading
-        Leaves stock symbols unchanged (e.g., "AAPL" -> "AAPL")
+        - normalized: "XRP/USD" -> "XRPUSD" for the trading API; stocks unchanged
+        - is_crypto: crypto symbols contain "/" (e.g, "BTC/USD"), stocks don't
+        - tif: GTC (Good-Til-Canceled) for crypto, DAY for stocks
         """
-        return symbol.replace('/', '')
+        meta = self._sym_meta.get(symbol)
+        if meta is None:
+            is_crypto = "/" in symbol
+            meta = self._sym_meta[symbol] = SymbolMeta(
+                raw = symbol,
+                normalized = symbol.replace('/', ''),
+                is_crypto = is_crypto,
+                tif = TimeInForce.GTC if is_crypto else TimeInForce.DAY,
+            )
+        return meta
+
+    def _normalize_symbol(self, symbol: str) -> str:
+        """ Converts "XRP/USD" -> "XRPUSD" for crypto trading; stock symbols unchanged """
+        return self._meta(symbol).normalized
     
     def _is_crypto(self, symbol: str) -> bool:
-        """
-        Determine if symbol is crypto based on format
-
-        Crypto symbols contains "/" (e.g, "BTC/USD")
-        Stock symbols don't (e.g., "AAPL")
-        """
-        return "/" in symbol
+        """ Determine if symbol is crypto based on format """
+        return self._meta(symbol).is_crypto
     
     def _get_time_in_force(self, symbol: str) -> TimeInForce:
-        """
-        Get appropriate TimeInForce for asset type.
+        """ Get appropriate TimeInForce for asset type (stocks: DAY, crypto: GTC) """
+        return self._meta(symbol).tif
 
-        - Stocks: DAY
-        - Crypto: GTC (Good-Til-Canceled)
+    def get_account_summary(self):
         """
-        if self._is_crypto(symbol):
-            return TimeInForce.GTC
-        return TimeInForce.DAY
+        Account id, status, cash and portfolio value.
 
-    def get_account_summary(self):
-        account = self.client.get_account()
-        return {
-            "id": account.id,
-            "status": account.status,
-            "cash": float(account.cash),
-            "portfolio_value": float(account.portfolio_value),
-        }
+        Cached for ACCOUNT_SUMMARY_TTL seconds so several callers in the same
+        tick share one REST call; any fill invalidates the cache.
+        """
+        now = time.monotonic()
+        if self._account_summary is None or now - self._account_summary_at >= self.ACCOUNT_SUMMARY_TTL:
+            account_id, status, cash, portfolio_value = _ACCOUNT_FIELDS(self.client.get_account())
+            self._account_summary = {
+                "id": account_id,
+                "status": status,
+                "cash": float(cash),
+                "portfolio_value": float(portfolio_value),
+            }
+            self._account_summary_at = now
+        return dict(self._account_summary)
 
     def get_positions(self):
         positions = self.client.get_positions()
+        if not positions:
+            return []
+
+        # Pull attributes with one C-level getter per row, then cast each numeric column at once
+        symbols, qty, market_value, unrealized_pl = zip(*map(_POSITION_FIELDS, positions))
+        qty = np.asarray(qty, dtype = float).tolist()
+        market_value = np.asarray(market_value, dtype = float).tolist()
+        unrealized_pl = np.asarray(unrealized_pl, dtype = float).tolist()
         return [
-            {
-                "symbol": p.symbol,
-                "qty": float(p.qty),
-                "market_value": float(p.market_value),
-                "unrealized_pl": float(p.unrealized_pl),
-            }
-            for p in positions
+            {"symbol": s, "qty": q, "market_value": mv, "unrealized_pl": pl}
+            for s, q, mv, pl in zip(symbols, qty, market_value, unrealized_pl)
         ]
 
     def buy(self, symbol: str, qty: int, latest_price: float):
         # Get the quantity of this symbol's positions before purchase
         self._position_before_order[symbol] = self._get_position_qty(symbol)
 
+        meta = self._meta(symbol)
         notional_value = qty * latest_price
-        asset_type = "crypto" if self._is_crypto(symbol) else "stock"
+        asset_type = "crypto" if meta.is_crypto else "stock"
         print(f"[DEBUG] BUY {symbol} ({asset_type}) qty={qty} price={latest_price:.4f} notional=${notional_value:.2f}")
 
-        if self._is_crypto(symbol) and notional_value < 10.0:
+        if meta.is_crypto and notional_value < 10.0:
             print(
                 f"Skipping {symbol}: "
                 f"order notional ${notional_value:.2f} below $10 minimum."
@@ -79,13 +131,16 @@ class AlpacaBroker(BaseBroker):
             return None
 
         order = MarketOrderRequest(
-            symbol=self._normalize_symbol(symbol),
+            symbol=meta.normalized,
             qty=qty,
             side=OrderSide.BUY,
-            time_in_force=self._get_time_in_force(symbol),
+            time_in_force=meta.tif,
         )
+        self._ensure_trade_stream()
         order_response = self.client.raw_submit_order(order)
         filled_order = self._wait_for_fill(order_response.id)
+        self._positions_stale = True
+        self._account_summary = None
         
         return filled_order
 
@@ -93,23 +148,70 @@ class AlpacaBroker(BaseBroker):
         # Get the quantity of this symbol's position before selling
         self._position_before_order[symbol] = self._get_position_qty(symbol)
 
+        meta = self._meta(symbol)
         order = MarketOrderRequest(
-            symbol=self._normalize_symbol(symbol),
+            symbol=meta.normalized,
             qty=qty,
             side=OrderSide.SELL,
-            time_in_force=self._get_time_in_force(symbol),
+            time_in_force=meta.tif,
         )
+        self._ensure_trade_stream()
         order_response = self.client.raw_submit_order(order)
         filled_order = self._wait_for_fill(order_response.id)
+        self._positions_stale = True
+        self._account_summary = None
 
         return filled_order
 
     def list_orders(self, status: str = "open"):
         return self.client.trading.get_orders(status=status)
     
+    def _ensure_trade_stream(self):
+        """ Start the trade-updates websocket in a background thread (once). """
+        if self._stream is not None:
+            return
+        try:
+            self._stream = TradingStream(
+                self.client.api_key, self.client.secret_key, paper = self.paper
+            )
+            self._stream.subscribe_trade_updates(self._on_trade_update)
+            threading.Thread(target = self._stream.run, daemon = True).start()
+        except Exception as e:
+            print(f"Trade update stream unavailable, polling for fills: {e}")
+
+    def _fill_event(self, order_id: str) -> threading.Event:
+        """ Register (or get) the event signalled when order_id fills; called by waiters only. """
+        with self._fill_lock:
+            event = self._fill_events.get(order_id)
+            if event is None:
+                event = self._fill_events[order_id] = threading.Event()
+            return event
+
+    async def _on_trade_update(self, data):
+        """
+        Trade-updates stream handler: mark cached positions stale and wake the
+        waiter for the filled order, if any.
+
+        Fills for orders nobody is waiting on (later partial fills, orders placed
+        elsewhere) are not recorded, so nothing accumulates for them.
+        """
+        if data.event in ("fill", "partial_fill"):
+            self._positions_stale = True
+            self._account_summary = None
+            order_id = str(data.order.id)
+            with self._fill_lock:
+                event = self._fill_events.get(order_id)
+                if event is not None:
+                    self._filled_orders[order_id] = data.order
+                    event.set()
+
     def _wait_for_fill(self, order_id: str, timeout_seconds: int = 30):
         """
-        Poll order status until filled or timeout.
+        Wait until an order is filled or the timeout expires.
+
+        Fills are normally picked up from the trade-updates stream. Between
+        stream checks the order is polled over REST with exponential backoff
+        (0.1s doubling up to 2s) in case the stream is down or not yet connected.
 
         Args:
             order_id: Order ID to monitor
@@ -118,18 +220,35 @@ class AlpacaBroker(BaseBroker):
         Returns:
             Filled order object
         """
-        start_time = time.time()
+        key = str(order_id)
+        event = self._fill_event(key)
+        # Monotonic deadline so wall-clock (NTP) adjustments can't cut the wait short or stretch it
+        deadline = time.monotonic() + timeout_seconds
+        delay = 0.1
+
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if event.wait(min(remaining, delay)):
+                    with self._fill_lock:
+                        order = self._filled_orders.pop(key, None)
+                    if order is not None:
+                        return order
 
-        while time.time() - start_time < timeout_seconds:
-            order = self.client.trading.get_order_by_id(order_id)
+                order = self.client.trading.get_order_by_id(order_id)
+                if order.status in [
+                    OrderStatus.FILLED,
+                    OrderStatus.PARTIALLY_FILLED
+                ]:
+                    return order
 
-            if order.status in [
-                OrderStatus.FILLED,
-                OrderStatus.PARTIALLY_FILLED
-            ]:
-                return order
-            
-            time.sleep(0.2)
+                delay = min(2.0, delay * 2)
+        finally:
+            with self._fill_lock:
+                self._fill_events.pop(key, None)
+                self._filled_orders.pop(key, None)
         
         print(f"Order {order_id} not filled within {timeout_seconds}s - cancelling.")
         try:
@@ -140,13 +259,18 @@ class AlpacaBroker(BaseBroker):
         
         return self.client.trading.get_order_by_id(order_id)
     
-    def get_order_details(self, order_response: Order, symbol: str) -> dict:
+    def get_order_details(self, order_response: Order, symbol: str, out: Optional[dict] = None) -> dict:
         """
         Extract fill price and quantity from order response.
 
         For crypto trades Alpaca deducts taker fees from the received asset. We calculate the actual
         filled qty (after fees) by comparing position size before/after the order.
 
+        Args:
+            order_response: Order returned by buy / sell
+            symbol: Trading symbol
+            out: Optional dict to fill in place (and return) instead of allocating a new one
+
         Returns:
             dict with 'filled_qty' and 'filled_price'
         """
@@ -180,31 +304,45 @@ class AlpacaBroker(BaseBroker):
         else:
             filled_qty = (float(order_response.filled_qty) if order_response.filled_qty else 0.0)
 
-        return {
-            "filled_qty": filled_qty,
-            "filled_price": filled_price,
-            "order_id": order_response.id,
-            "status": order_response.status,
-            "qty_requested": order_response.qty
-        }
+        details = out if out is not None else {}
+        details["filled_qty"] = filled_qty
+        details["filled_price"] = filled_price
+        details["order_id"] = order_response.id
+        details["status"] = order_response.status
+        details["qty_requested"] = order_response.qty
+        return details
     
+    def _positions(self, refresh: bool = False) -> dict:
+        """
+        Position qty keyed by symbol.
+
+        Cached between calls and only re-fetched when marked stale (after a
+        fill) or when refresh is requested.
+        """
+        if refresh or self._positions_stale:
+            self._positions_by_symbol = {
+                pos.symbol: float(pos.qty) for pos in self.client.get_positions()
+            }
+            self._positions_stale = False
+        return self._positions_by_symbol
+
     def _get_position_qty(self, symbol: str) -> float:
         """
         Get actual position quantity from broker.
 
-        Handles both "XRP/USD" and "XRPUSD" formats
+        Handles both "XRP/USD" and "XRPUSD" formats. A symbol missing from
+        the cache gets one forced refresh, since a fresh fill can take a
+        moment to show up in the positions endpoint.
         """
-        normalized = symbol.replace("/", "")
+        normalized = self._meta(symbol).normalized
 
-        for attempt in range(5):
-            positions = self.client.get_positions()
-
-            for pos in positions:
-                if pos.symbol == symbol or pos.symbol == normalized:
-                    return float(pos.qty)
-            
-            if attempt < 4:
+        for refresh in (False, True):
+            if refresh:
                 time.sleep(0.1)
+            positions = self._positions(refresh = refresh)
+            qty = positions.get(symbol, positions.get(normalized))
+            if qty is not None:
+                return qty
         
         return 0.0
     
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 class BaseBroker(ABC):
     """
@@ -34,9 +34,11 @@ class BaseBroker(ABC):
         pass
 
     @abstractmethod
-    def get_order_details(self, order: object, symbol: str) -> Dict:
+    def get_order_details(self, order: object, symbol: str, out: Optional[Dict] = None) -> Dict:
         """
         Extract fill details from order, accounting for broker fees.
+        If `out` is given it is filled in place and returned, so callers can
+        reuse one dict across orders.
         
         Returns dict with:
         {
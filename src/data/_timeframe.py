@@ -0,0 +1,21 @@
+from alpaca.data.timeframe import TimeFrame
+
+# Built once at import; every request for the same string reuses the same TimeFrame
+_TIMEFRAMES = {
+    "1Min": TimeFrame.Minute,
+    "5Min": TimeFrame(5, "Min"),
+    "15Min": TimeFrame(15, "Min"),
+    "1Hour": TimeFrame.Hour,
+    "1Day": TimeFrame.Day,
+}
+
+# TimeFrame has no __eq__, so intraday checks go by the timeframe string
+INTRADAY_TIMEFRAMES = frozenset({"1Min", "5Min", "15Min", "1Hour"})
+
+
+def map_timeframe(tf: str) -> TimeFrame:
+    """ Map a timeframe string ("1Min", "5Min", "15Min", "1Hour", "1Day") to an alpaca TimeFrame. """
+    try:
+        return _TIMEFRAMES[tf]
+    except KeyError:
+        raise ValueError(f"Unsupported timeframe: {tf}") from None
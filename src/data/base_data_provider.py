@@ -1,7 +1,68 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
 import pandas as pd
 
+
+class Bars(NamedTuple):
+    """
+    OHLCV bars as plain NumPy arrays (one per field), for consumers that only
+    need a column or two and don't want a DataFrame per call.
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: Optional[pd.DataFrame]) -> "Bars":
+        """ Extract each OHLCV column of a bars DataFrame once. """
+        if df is None or df.empty:
+            empty = np.empty(0, dtype = np.float64)
+            return cls(np.empty(0, dtype = object), empty, empty, empty, empty, empty)
+        return cls(
+            df.index.to_numpy(),
+            *(df[col].to_numpy(dtype = np.float64) for col in ("open", "high", "low", "close", "volume")),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """ The bars as an OHLCV DataFrame indexed by timestamp, sharing the arrays (read-only). """
+        return pd.DataFrame(
+            {col: getattr(self, col) for col in ("open", "high", "low", "close", "volume")},
+            index = self.ts,
+            copy = False,
+        )
+
+
+def _ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    OHLCV columns of a single-symbol bars frame in time order.
+
+    Alpaca already returns bars sorted, so the sort only runs when needed, and
+    the column selection is returned as-is without an extra copy. Callers must
+    treat the frame as read-only.
+    """
+    bars = df[["open", "high", "low", "close", "volume"]]
+    if not bars.index.is_monotonic_increasing:
+        bars = bars.sort_index()
+    return bars
+
+
+def _split_bars(df: pd.DataFrame, symbols: List[str], limit: int) -> Dict[str, pd.DataFrame]:
+    """ Split a multi-symbol bars response into per-symbol frames of at most `limit` bars. """
+    present = set(df.index.get_level_values(0)) if isinstance(df.index, pd.MultiIndex) else set()
+    out = {}
+    for symbol in symbols:
+        if symbol not in present:
+            out[symbol] = pd.DataFrame(columns = ["open", "high", "low", "close", "volume"])
+            continue
+        out[symbol] = _ohlcv(df.xs(symbol)).head(limit)
+    return out
+
+
 class BaseDataProvider(ABC):
     """
     Abstract data provider for strategies. Implementations can be:
@@ -24,4 +85,27 @@ class BaseDataProvider(ABC):
         Implementations can map this to alpaca-py constructs
         """
         pass
-    
\ No newline at end of file
+    
+
+    def get_bars_multi(
+        self, symbols: List[str], timeframe: str, limit: int = 100, days_back: int = 7
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return bars for several symbols as {symbol: DataFrame}.
+        The default issues one get_bars call per symbol, concurrently; providers
+        that support multi-symbol requests should override this with a single call.
+        """
+        with ThreadPoolExecutor() as pool:
+            frames = pool.map(
+                lambda s: self.get_bars(symbol = s, timeframe = timeframe, limit = limit, days_back = days_back),
+                symbols,
+            )
+            return dict(zip(symbols, frames))
+
+    def get_bars_arrays(
+        self, symbol: str, timeframe: str, limit: int = 100, days_back: int = 7
+    ) -> Bars:
+        """ Same bars as get_bars, returned as a Bars tuple of NumPy arrays. """
+        return Bars.from_frame(
+            self.get_bars(symbol = symbol, timeframe = timeframe, limit = limit, days_back = days_back)
+        )
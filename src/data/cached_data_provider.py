@@ -0,0 +1,79 @@
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import time
+import pandas as pd
+
+from .base_data_provider import BaseDataProvider
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "trading-system"
+
+
+class CachedDataProvider(BaseDataProvider):
+    """
+    Wraps another data provider and memoizes historical bars, in-process and on disk.
+
+    Intended for backtests, where the same (symbol, timeframe, limit, days_back) request
+    is repeated on every re-run. Bars are written to parquet under cache_dir and reused,
+    from memory or disk, until they are older than max_age seconds. Latest prices are
+    never cached.
+
+    Cached frames are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+            self,
+            provider: BaseDataProvider,
+            cache_dir: Optional[Path] = None,
+            max_age: float = 24 * 60 * 60,
+    ):
+        self.provider = provider
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_age = max_age
+        # key -> (time.time() the bars were fetched, bars)
+        self._memory: Dict[Tuple, Tuple[float, pd.DataFrame]] = {}
+
+    def get_latest_price(self, symbol: str) -> Optional[float]:
+        return self.provider.get_latest_price(symbol)
+
+    def get_bars(
+        self, symbol: str, timeframe: str, limit: int = 100, days_back: int = 7
+    ) -> pd.DataFrame:
+        """ Return bars from the in-process cache, the disk cache, or the wrapped provider. """
+        key = (symbol, timeframe, limit, days_back)
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None and now - entry[0] < self.max_age:
+            return entry[1]
+
+        # Expired entries are dropped whenever a request misses, so the cache stays bounded
+        self._memory = {k: e for k, e in self._memory.items() if now - e[0] < self.max_age}
+        fetched_at, bars = self._load_bars(symbol, timeframe, limit, days_back)
+        self._memory[key] = (fetched_at, bars)
+        return bars
+
+    def clear(self):
+        """ Drop the in-process cache (disk entries expire via max_age). """
+        self._memory.clear()
+
+    def _cache_path(self, symbol: str, timeframe: str, limit: int, days_back: int) -> Path:
+        safe_symbol = symbol.replace("/", "-")
+        return self.cache_dir / f"{safe_symbol}_{timeframe}_{days_back}_{limit}.parquet"
+
+    def _load_bars(
+        self, symbol: str, timeframe: str, limit: int, days_back: int
+    ) -> Tuple[float, pd.DataFrame]:
+        """ (time the bars were fetched, bars) from the disk cache or the wrapped provider. """
+        path = self._cache_path(symbol, timeframe, limit, days_back)
+        if path.exists():
+            mtime = path.stat().st_mtime
+            if time.time() - mtime < self.max_age:
+                return mtime, pd.read_parquet(path)
+
+        fetched_at = time.time()
+        bars = self.provider.get_bars(
+            symbol = symbol, timeframe = timeframe, limit = limit, days_back = days_back
+        )
+        if bars is not None and not bars.empty:
+            path.parent.mkdir(parents = True, exist_ok = True)
+            bars.to_parquet(path)
+        return fetched_at, bars
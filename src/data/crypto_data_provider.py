@@ -1,25 +1,15 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List
 import pandas as pd
 
 from alpaca.data.live import CryptoDataStream
 from alpaca.data.historical import CryptoHistoricalDataClient
 from alpaca.data.requests import CryptoBarsRequest, CryptoLatestQuoteRequest
-from alpaca.data.timeframe import TimeFrame
 
-from .base_data_provider import BaseDataProvider
+from src.alpaca_client import pool_connections
+
+from .base_data_provider import BaseDataProvider, _ohlcv, _split_bars
+from ._timeframe import map_timeframe
 
-def _map_timeframe(tf: str) -> TimeFrame:
-    if tf == "1Min":
-        return TimeFrame.Minute
-    if tf == "5Min":
-        return TimeFrame(5, "Min")
-    if tf == "15Min":
-        return TimeFrame(15, "Min")
-    if tf == "1Hour":
-        return TimeFrame.Hour
-    if tf == "1Day":
-        return TimeFrame.Day
-    raise ValueError(f"Unsupported timeframe: {tf}")
 
 class CryptoDataProvider(BaseDataProvider):
     """
@@ -29,7 +19,7 @@ class CryptoDataProvider(BaseDataProvider):
 
     def __init__(self, api_key: str, secret_key: str):
         self.stream = CryptoDataStream(api_key, secret_key)
-        self.hist = CryptoHistoricalDataClient(api_key, secret_key)
+        self.hist = pool_connections(CryptoHistoricalDataClient(api_key, secret_key))
     
     def get_latest_price(self, symbol: str) -> Optional[float]:
         """ Get latest ask price (what we'd pay to buy) """
@@ -62,7 +52,7 @@ class CryptoDataProvider(BaseDataProvider):
         """
         from datetime import datetime, timedelta, timezone
         
-        tf = _map_timeframe(timeframe)
+        tf = map_timeframe(timeframe)
         now = datetime.now(timezone.utc)
         start = now - timedelta(days=days_back)
         
@@ -78,8 +68,36 @@ class CryptoDataProvider(BaseDataProvider):
             return df
         if isinstance(df.index, pd.MultiIndex):
             df = df.xs(symbol)
-        df = df.sort_index()
-        return df[["open", "high", "low", "close", "volume"]].copy()
+        return _ohlcv(df)
+
+    def get_bars_multi(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        limit: int = 100,
+        days_back: int = 7,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get historical bars for several symbols with a single request.
+
+        Alpaca applies `limit` to the combined response, so the request is made
+        without it and each symbol is trimmed to its first `limit` bars instead.
+        Symbols with no data map to an empty DataFrame.
+        """
+        if len(symbols) == 1:
+            return {symbols[0]: self.get_bars(symbols[0], timeframe, limit = limit, days_back = days_back)}
+
+        from datetime import datetime, timedelta, timezone
+
+        now = datetime.now(timezone.utc)
+        req = CryptoBarsRequest(
+            symbol_or_symbols=list(symbols),
+            timeframe=map_timeframe(timeframe),
+            start=now - timedelta(days=days_back),
+            end=now,
+        )
+        df = self.hist.get_crypto_bars(req).df
+        return _split_bars(df, symbols, limit)
     
     def on_quote(self, symbol: str, handler: Callable):
         """ Subscribe to quote updates (async handler required) """
@@ -1,28 +1,16 @@
 # src/data/stock_data_provider.py
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List
 import pandas as pd
 
 from alpaca.data.live import StockDataStream
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest, StockLatestQuoteRequest
-from alpaca.data.timeframe import TimeFrame
 
-from .base_data_provider import BaseDataProvider
+from src.alpaca_client import pool_connections
 
-
-def _map_timeframe(tf: str) -> TimeFrame:
-    if tf == "1Min":
-        return TimeFrame.Minute
-    if tf == "5Min":
-        return TimeFrame(5, "Min")
-    if tf == "15Min":
-        return TimeFrame(15, "Min")
-    if tf == "1Hour":
-        return TimeFrame.Hour
-    if tf == "1Day":
-        return TimeFrame.Day
-    raise ValueError(f"Unsupported timeframe: {tf}")
+from .base_data_provider import BaseDataProvider, _ohlcv, _split_bars
+from ._timeframe import map_timeframe, INTRADAY_TIMEFRAMES
 
 
 class StockDataProvider(BaseDataProvider):
@@ -33,7 +21,7 @@ class StockDataProvider(BaseDataProvider):
 
     def __init__(self, api_key: str, secret_key: str):
         self.stream = StockDataStream(api_key, secret_key)
-        self.hist = StockHistoricalDataClient(api_key, secret_key)
+        self.hist = pool_connections(StockHistoricalDataClient(api_key, secret_key))
 
     def get_latest_price(self, symbol: str) -> Optional[float]:
         """ Get the latest ask price (what we'd pay to buy) """
@@ -49,6 +37,21 @@ class StockDataProvider(BaseDataProvider):
             return None
 
 
+    def _bars_window(self, timeframe: str, days_back: int):
+        """ Resolve the TimeFrame and [start, end] range for a bars request. """
+        tf = map_timeframe(timeframe)
+        now = datetime.now(timezone.utc)
+
+        # Buffer end for intraday frames to avoid incomplete bar edge cases
+        if timeframe in INTRADAY_TIMEFRAMES:
+            end = now - timedelta(minutes=2)
+        else:
+            # Daily bars: buffer by 15 minutes
+            end = now - timedelta(minutes=15)
+
+        start = end - timedelta(days=days_back)
+        return tf, start, end
+
     def get_bars(
         self,
         symbol: str,
@@ -65,22 +68,7 @@ class StockDataProvider(BaseDataProvider):
             limit: Max number of bars to return
             days_back: How many days back to fetch data from
         """
-        tf = _map_timeframe(timeframe)
-        now = datetime.now(timezone.utc)
-
-        # Buffer end for intraday frames to avoid incomplete bar edge cases
-        if tf in (
-            TimeFrame.Minute,
-            TimeFrame(5, "Min"),
-            TimeFrame(15, "Min"),
-            TimeFrame.Hour,
-        ):
-            end = now - timedelta(minutes=2)
-        else:
-            # Daily bars: buffer by 15 minutes
-            end = now - timedelta(minutes=15)
-
-        start = end - timedelta(days=days_back)
+        tf, start, end = self._bars_window(timeframe, days_back)
 
         req = StockBarsRequest(
             symbol_or_symbols=symbol,
@@ -94,8 +82,34 @@ class StockDataProvider(BaseDataProvider):
             return df
         if isinstance(df.index, pd.MultiIndex):
             df = df.xs(symbol)
-        df = df.sort_index()
-        return df[["open", "high", "low", "close", "volume"]].copy()
+        return _ohlcv(df)
+
+    def get_bars_multi(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        limit: int = 100,
+        days_back: int = 7,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get historical bars for several symbols with a single request.
+
+        Alpaca applies `limit` to the combined response, so the request is made
+        without it and each symbol is trimmed to its first `limit` bars instead.
+        Symbols with no data map to an empty DataFrame.
+        """
+        if len(symbols) == 1:
+            return {symbols[0]: self.get_bars(symbols[0], timeframe, limit = limit, days_back = days_back)}
+
+        tf, start, end = self._bars_window(timeframe, days_back)
+        req = StockBarsRequest(
+            symbol_or_symbols=list(symbols),
+            timeframe=tf,
+            start=start,
+            end=end,
+        )
+        df = self.hist.get_stock_bars(req).df
+        return _split_bars(df, symbols, limit)
 
     def on_quote(self, symbol: str, handler: Callable):
         """Subscribe to quote updates (async handler required)"""
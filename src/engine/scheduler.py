@@ -1,6 +1,24 @@
-import pytz
 from datetime import datetime, time
+from functools import lru_cache
+from time import time as unix_time
 from typing import Tuple
+from zoneinfo import ZoneInfo
+
+_ET = ZoneInfo("America/New_York")
+_SECONDS_PER_DAY = 86400
+
+
+@lru_cache(maxsize = 8)
+def _et_utc_offset(utc_day: int) -> int:
+    """
+    ET offset from UTC in seconds for a UTC day number (days since the epoch).
+
+    Sampled at noon UTC. DST switches happen early Sunday morning ET, when the
+    stock market is closed anyway, so one offset per UTC day is enough.
+    """
+    noon = datetime.fromtimestamp(utc_day * _SECONDS_PER_DAY + _SECONDS_PER_DAY // 2, tz = _ET)
+    return int(noon.utcoffset().total_seconds())
+
 
 class Scheduler:
     """ Handles market hours detection and scheduling """
@@ -9,6 +27,10 @@ class Scheduler:
     STOCK_OPEN= time(9, 30)
     STOCK_CLOSE = time(16, 0)
 
+    # Same hours as seconds since midnight ET, for the integer comparison in is_market_open
+    _STOCK_OPEN_SECONDS = 9 * 3600 + 30 * 60
+    _STOCK_CLOSE_SECONDS = 16 * 3600
+
     CRYPTO_ALWAYS_OPEN = True
 
     @staticmethod
@@ -26,17 +48,18 @@ class Scheduler:
             return True
         
         if asset_type.lower() == "stock":
-            et = pytz.timezone("America/New_York")
-            now = datetime.now(et)
+            now = int(unix_time())
+            local_day, seconds_of_day = divmod(
+                now + _et_utc_offset(now // _SECONDS_PER_DAY), _SECONDS_PER_DAY
+            )
 
-            # Saturday or Sunday
-            if now.weekday() >= 5:
+            # Saturday or Sunday (day 0 of the epoch was a Thursday)
+            if (local_day + 3) % 7 >= 5:
                 return False
             
             # Check market hours
-            current_time = now.time()
             return(
-                Scheduler.STOCK_OPEN <= current_time < Scheduler.STOCK_CLOSE
+                Scheduler._STOCK_OPEN_SECONDS <= seconds_of_day < Scheduler._STOCK_CLOSE_SECONDS
             )
         
         raise ValueError(
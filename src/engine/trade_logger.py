@@ -1,11 +1,57 @@
 import csv
 import json
+import queue
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from functools import lru_cache
+from threading import Thread, Event
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = get_logger(__name__)
+
+_HEADER = (
+    "symbol",
+    "entry_time",
+    "exit_time",
+    "entry_price",
+    "exit_price",
+    "quantity",
+    "pnl",
+    "pnl_percent",
+    "exit_reason"
+)
+
+# Queue marker: (_FLUSH, done event, close files afterwards)
+_FLUSH = object()
+
+_DROP_SLASH = str.maketrans("", "", "/")
+
+@lru_cache(maxsize = 64)
+def _normalize_symbol(symbol: str) -> str:
+    """ Symbol without "/" (memoized; the set of traded symbols is small). """
+    return symbol.translate(_DROP_SLASH)
 
 class TradeLogger:
-    """ Logs all trades to CSV and generates daily summaries """
+    """
+    Logs all trades to CSV and generates daily summaries.
+
+    log_trade only enqueues the trade; a background thread drains the queue in
+    small batches and writes them grouped by file, so disk I/O stays off the
+    trading path. Call flush() to wait for queued trades and close() on shutdown.
+    """
+
+    # Max trades written per batch, and how long to wait for a batch to fill
+    BATCH_SIZE = 256
+    BATCH_TIMEOUT = 0.05
 
     def __init__(self, log_dir: str = "logs"):
         """
@@ -16,6 +62,32 @@ class TradeLogger:
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok = True)
+
+        # Open (file, csv.writer) per (normalized symbol, date), reused across trades.
+        # Only touched by the writer thread
+        self._writers: Dict[Tuple[str, str], tuple] = {}
+        self._writers_day = ""
+
+        # Today's date and its "%Y-%m-%d" form, refreshed only when the date changes
+        self._today_date: Optional[date] = None
+        self._today_str = ""
+
+        self._queue = queue.SimpleQueue()
+        self._writer_thread = Thread(target = self._drain, daemon = True)
+        self._writer_thread.start()
+
+    @property
+    def writer_thread(self) -> Thread:
+        """ The background thread that writes queued trades (e.g. for CPU pinning). """
+        return self._writer_thread
+
+    def _get_today(self) -> str:
+        """ Return today's date as "%Y-%m-%d", formatting it only once per day. """
+        d = date.today()
+        if d != self._today_date:
+            self._today_date = d
+            self._today_str = d.strftime("%Y-%m-%d")
+        return self._today_str
     
     def _normalize_symbol(self, symbol: str) -> str:
         """
@@ -23,7 +95,7 @@ class TradeLogger:
         
         Removes "/" from crypto currencies to avoid path issues
         """
-        return symbol.replace("/", "")
+        return _normalize_symbol(symbol)
     
     def log_trade(
             self,
@@ -38,7 +110,7 @@ class TradeLogger:
             pnl_percent: float
     ) -> None:
         """
-        Log a completed trade to CSV.
+        Queue a completed trade to be written to CSV by the background writer.
 
         Args:
             symbol: Trading symbol
@@ -51,56 +123,179 @@ class TradeLogger:
             pnl: Profit/loss in dollars
             pnl_percent: Return percentage
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        normalized_symbol = self._normalize_symbol(symbol)
+        self._queue.put((
+            self._get_today(),
+            symbol,
+            entry_price,
+            exit_price,
+            quantity,
+            entry_time,
+            exit_time,
+            exit_reason,
+            pnl,
+            pnl_percent
+        ))
+
+    def flush(self) -> None:
+        """ Block until every trade queued so far is written and flushed to disk. """
+        done = Event()
+        self._queue.put((_FLUSH, done, False))
+        done.wait()
+
+    def close(self) -> None:
+        """
+        Write out queued trades and close all open trade log files.
+        The logger stays usable; files are reopened by the next trade.
+        """
+        done = Event()
+        self._queue.put((_FLUSH, done, True))
+        done.wait()
+
+    def _drain(self) -> None:
+        """ Writer thread: collect queued trades into batches and write them. """
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.BATCH_TIMEOUT
+            while len(batch) < self.BATCH_SIZE and batch[-1][0] is not _FLUSH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout = remaining))
+                except queue.Empty:
+                    break
+
+            marker = batch.pop() if batch[-1][0] is _FLUSH else None
+            try:
+                self._write_batch(batch)
+                if marker is not None and marker[2]:
+                    self._close_files()
+            except Exception:
+                log.exception("Error writing trade log")
+
+            if marker is not None:
+                marker[1].set()
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        """
+        Format a batch of queued trades and write it with one writerows + flush per file.
+
+        A trade that can't be formatted is logged and skipped on its own. If writing
+        a file's rows fails, they are retried one at a time on a reopened file, so
+        one bad row or handle doesn't cost the rest of the batch.
+        """
+        rows_by_file: Dict[Tuple[str, str], list] = {}
+        for trade in batch:
+            try:
+                key, row = self._format_trade(trade)
+            except Exception:
+                log.exception("Could not format trade for the trade log: %r", trade)
+                continue
+            rows_by_file.setdefault(key, []).append(row)
+
+        for (normalized_symbol, today), rows in rows_by_file.items():
+            try:
+                self._write_rows(normalized_symbol, today, rows)
+            except Exception:
+                log.exception(
+                    "Error writing %d trade(s) for %s, retrying one at a time", len(rows), normalized_symbol
+                )
+                self._drop_writer(normalized_symbol, today)
+                for row in rows:
+                    try:
+                        self._write_rows(normalized_symbol, today, [row])
+                    except Exception:
+                        log.exception("Trade log row lost: %r", row)
+                        self._drop_writer(normalized_symbol, today)
+
+    def _format_trade(self, trade: tuple) -> Tuple[Tuple[str, str], tuple]:
+        """ ((normalized symbol, date) file key, CSV row) for one queued trade. """
+        (
+            today, symbol, entry_price, exit_price, quantity,
+            entry_time, exit_time, exit_reason, pnl, pnl_percent,
+        ) = trade
+        return (self._normalize_symbol(symbol), today), (
+            symbol,
+            entry_time.isoformat(),
+            exit_time.isoformat(),
+            f"{entry_price:.8f}",
+            f"{exit_price:.8f}",
+            f"{quantity:.8f}",
+            f"{pnl:.4f}",
+            f"{pnl_percent:.2f}%",
+            exit_reason
+        )
+
+    def _write_rows(self, normalized_symbol: str, today: str, rows: list) -> None:
+        """ Append rows to a symbol's log of today and flush it. """
+        (f, writer), is_empty = self._get_writer(normalized_symbol, today)
+        # An empty file (new or pre-existing) gets the header in the same write
+        if is_empty:
+            writer.writerow(_HEADER)
+        writer.writerows(rows)
+        # Flush (not close) so readers of today's file see the trades
+        f.flush()
+
+    def _drop_writer(self, normalized_symbol: str, today: str) -> None:
+        """ Close and forget a cached file after a write error, so the next write reopens it. """
+        entry = self._writers.pop((normalized_symbol, today), None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except Exception:
+                pass
+
+    def _get_writer(self, normalized_symbol: str, today: str):
+        """
+        Return the cached (file, writer) for a symbol's log of today, opening it on first use,
+        and whether the file is still empty (i.e. needs a header).
+        Handles left over from a previous day are closed when the date rolls over.
+        """
+        key = (normalized_symbol, today)
+        entry = self._writers.get(key)
+        if entry is not None:
+            return entry, False
+
+        if today != self._writers_day:
+            self._close_files()
+            self._writers_day = today
+
         log_file = self.log_dir / f"trades_{normalized_symbol}_{today}.csv"
+        f = open(log_file, "a", newline="", buffering = 1 << 16)
+        entry = self._writers[key] = (f, csv.writer(f))
+        return entry, f.tell() == 0
+
+    def _close_files(self) -> None:
+        """ Close all cached trade log files (writer thread only). """
+        for f, _ in self._writers.values():
+            f.close()
+        self._writers.clear()
 
-        file_exists = log_file.exists()
-
-        with open(log_file, "a", newline="") as f:
-            writer = csv.writer(f)
-
-            if not file_exists:
-                writer.writerow([
-                    "symbol",
-                    "entry_time",
-                    "exit_time",
-                    "entry_price",
-                    "exit_price",
-                    "quantity",
-                    "pnl",
-                    "pnl_percent",
-                    "exit_reason"
-                ])
-            
-            writer.writerow([
-                symbol,
-                entry_time.isoformat(),
-                exit_time.isoformat(),
-                f"{entry_price:.8f}",
-                f"{exit_price:.8f}",
-                f"{quantity:.8f}",
-                f"{pnl:.4f}",
-                f"{pnl_percent:.2f}%",
-                exit_reason
-            ])
-        
     def log_daily_summary(
             self,
             summary_data: dict
     ) -> None:
         """
-        Log daily performance summary as JSON
+        Append a daily performance summary to today's JSONL file.
+
+        Each call adds one JSON line, so intra-day checkpoints keep their
+        history and the latest summary is the last line.
 
         Args:
-            summary_dat: Dict with daily metrics
+            summary_data: Dict with daily metrics
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        summary_file = self.log_dir / f"daily_summary_{today}.json"
+        summary_file = self.log_dir / f"daily_summary_{self._get_today()}.jsonl"
+
+        # orjson serializes datetimes and numpy values natively; stdlib json is the fallback
+        if orjson is not None:
+            line = orjson.dumps(summary_data, option = orjson.OPT_SERIALIZE_NUMPY, default = str)
+        else:
+            line = json.dumps(summary_data, default = str).encode()
+
+        # One write of the whole line in append mode
+        with open(summary_file, "ab") as f:
+            f.write(line + b"\n")
 
-        with open(summary_file, "w") as f:
-            json.dump(summary_data, f, indent = 2, default = str)
-    
     def get_today_trades(self, symbol: str) -> list:
         """
         Get all trades logged today for a symbol.
@@ -111,16 +306,15 @@ class TradeLogger:
         Returns:
             List of trade dicts
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_file = self.log_dir / f"trades_{symbol}_{today}.csv"
+        # Make sure trades still in the write queue are on disk
+        self.flush()
+
+        today = self._get_today()
+        log_file = self.log_dir / f"trades_{self._normalize_symbol(symbol)}_{today}.csv"
 
         if not log_file.exists():
             return []
-        
-        trades = []
-        with open(log_file, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                trades.append(row)
-        
-        return trades
\ No newline at end of file
+
+        # Parsed in C; values stay strings, as written
+        trades = pd.read_csv(log_file, dtype = str, keep_default_na = False)
+        return trades.to_dict(orient = "records")
\ No newline at end of file
@@ -1,17 +1,35 @@
+import heapq
+import os
+import sys
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
-from threading import Thread, Event
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from threading import Thread, Event, Lock
+import pandas as pd
 
 from src.engine.strategy_config import StrategyConfig
 from src.engine.scheduler import Scheduler
 from src.engine.trade_logger import TradeLogger
+from src.data.base_data_provider import Bars
 from src.data.stock_data_provider import StockDataProvider
 from src.data.crypto_data_provider import CryptoDataProvider
 from src.brokers.base_broker import BaseBroker
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, BUY, signal_name
 from src.portfolio.risk_config import RiskConfig
 from src.portfolio.position_manager import PositionManager
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def _reads_closes_only(strategy: BaseStrategy) -> bool:
+    """
+    Whether `strategy` overrides evaluate_signal_at with its own close-array
+    version; other strategies are handed the full bars through evaluate_signal.
+    """
+    return getattr(type(strategy), "evaluate_signal_at", None) is not BaseStrategy.evaluate_signal_at
+
 
 class TradingEngine:
     """
@@ -24,6 +42,32 @@ class TradingEngine:
     - Paper/live trading via Alpaca
     """
 
+    # Seconds before re-checking a strategy whose market is closed
+    MARKET_CLOSED_RECHECK_SECONDS = 60
+    # Seconds before retrying a strategy whose cycle didn't complete (no data / error)
+    RETRY_SECONDS = 1
+    # Seconds a broker positions snapshot is reused by _get_actual_position_qty
+    POSITIONS_TTL = 5.0
+    # Seconds the account value is shared across strategies (reset after any fill)
+    ACCOUNT_VALUE_TTL = 5.0
+    # Strategies run on hourly bars; the last close is used as the latest price
+    # unless that bar ended more than LATEST_PRICE_TOLERANCE seconds ago
+    BAR_TIMEFRAME = "1Hour"
+    BAR_SECONDS = 60 * 60
+    LATEST_PRICE_TOLERANCE = 5 * 60
+    # Bars fetched per strategy cycle
+    BAR_LIMIT = 200
+    BAR_DAYS_BACK = 7
+    # print_status layout
+    _STATUS_RULE = "=" * 60
+    _STATUS_STRATEGY = (
+        "\n  {}:\n"
+        "    Asset Type: {}\n"
+        "    Interval: {}s\n"
+        "    Last Run: {}\n"
+        "    Trades: {}\n"
+    ).format
+
     def __init__(
             self,
             broker: BaseBroker,
@@ -46,9 +90,29 @@ class TradingEngine:
         self.logger = TradeLogger(log_dir)
 
         self.strategies: Dict[str, StrategyConfig] = {}
+        # Enabled subset of self.strategies; the only configs the loop dispatches to
+        self._enabled_strategies: Dict[str, StrategyConfig] = {}
         self.is_running = False
         self.engine_thread: Optional[Thread] = None
         self.stop_event = Event()
+        # CPUs the worker threads are pinned to (see set_worker_affinity); None = unpinned
+        self._worker_affinity: Optional[Set[int]] = None
+
+        # Min-heap of (next run on the monotonic clock, strategy key). The loop sleeps
+        # until the earliest entry is due; _wake interrupts the sleep on add/stop
+        self._schedule: List[Tuple[float, str]] = []
+        self._schedule_lock = Lock()
+        self._wake = Event()
+
+        # Broker position qty keyed by "/"-less symbol, so "XRP/USD" and "XRPUSD" share a key
+        self._position_qty: Dict[str, float] = {}
+        self._position_qty_at = float("-inf")
+
+        self._account_value: Optional[float] = None
+        self._account_value_at = float("-inf")
+
+        # Reused for every order's fill details; read right after each call
+        self._order_details: Dict[str, object] = {}
 
     def add_strategy(
             self,
@@ -87,7 +151,31 @@ class TradingEngine:
         )
 
         self.strategies[key] = config
-        print(f"Registered strategy: {config}")
+        self._enabled_strategies[key] = config
+        self._schedule_if_idle(key)
+        log.info("Registered strategy: %s", config)
+
+    def enable_strategy(self, key: str) -> None:
+        """
+        Resume a disabled strategy; it runs on the next loop wake-up.
+
+        Args:
+            key: Strategy key, f"{symbol}_{asset_type}"
+        """
+        config = self.strategies[key]
+        config.enabled = True
+        self._enabled_strategies[key] = config
+        self._schedule_if_idle(key)
+
+    def disable_strategy(self, key: str) -> None:
+        """
+        Pause a strategy. It stays registered but is no longer scheduled.
+
+        Args:
+            key: Strategy key, f"{symbol}_{asset_type}"
+        """
+        self.strategies[key].enabled = False
+        self._enabled_strategies.pop(key, None)
     
     def start(self) -> None:
         """
@@ -96,56 +184,164 @@ class TradingEngine:
         Runs main loop in background thread
         """
         if self.is_running:
-            print("Engine already running")
+            log.info("Engine already running")
             return
         
         self.is_running = True
         self.stop_event.clear()
         self.engine_thread = Thread(target=self._run_loop, daemon = True)
         self.engine_thread.start()
-        print("TradingEngine started")
+        log.info("TradingEngine started")
     
     def stop(self) -> None:
         """ Stop trading engine gracefully. """
         if not self.is_running:
-            print("Engine not running")
+            log.info("Engine not running")
             return
         
-        print("Stopping TradingEngine...")
+        log.info("Stopping TradingEngine...")
         self.is_running = False
         self.stop_event.set()
+        self._wake.set()
 
         # Wait for thread to finish
         if self.engine_thread:
             self.engine_thread.join(timeout = 5)
+
+        # Write out any trades still queued in the logger
+        self.logger.close()
         
-        print("TradingEngine stopped...")
+        log.info("TradingEngine stopped...")
     
+    def set_worker_affinity(self, cpus: Iterable[int]) -> None:
+        """
+        Pin the engine's worker threads (the engine loop and the trade logger's
+        writer) to `cpus`, so they stay on warm caches between wake-ups instead
+        of migrating across cores.
+
+        The engine loop applies the setting itself when it starts, so this can
+        be called before or after start(). Only supported where the OS exposes
+        sched_setaffinity (Linux); elsewhere it logs a warning and does nothing.
+        """
+        if not hasattr(os, "sched_setaffinity"):
+            log.warning("CPU affinity is not supported on this platform")
+            return
+
+        self._worker_affinity = set(cpus)
+        for thread in (self.engine_thread, self.logger.writer_thread):
+            # Linux accepts a thread id in place of a pid
+            if thread is not None and thread.native_id is not None and thread.is_alive():
+                os.sched_setaffinity(thread.native_id, self._worker_affinity)
+
     def _run_loop(self) -> None:
         """ Main event loop (runs in background thread) """
-        print("Engine loop started")
+        if self._worker_affinity is not None:
+            os.sched_setaffinity(0, self._worker_affinity)
+        log.info("Engine loop started")
 
         while not self.stop_event.is_set():
             try:
                 self._execute_all_strategies()
-                time.sleep(1)
-            except Exception as e:
-                print(f"Error in engine loop: {e}")
+            except Exception:
+                log.exception("Error in engine loop")
+
+            # Sleep until the next strategy is due (or until woken by add_strategy/stop)
+            self._wake.wait(self._seconds_until_next_run())
+            self._wake.clear()
+
+    def _schedule_run(self, key: str, when: float) -> None:
+        """ Queue strategy `key` to run at monotonic time `when`. """
+        with self._schedule_lock:
+            heapq.heappush(self._schedule, (when, key))
+        self._wake.set()
+
+    def _schedule_if_idle(self, key: str) -> None:
+        """ Schedule `key` to run now unless it already has a pending run. """
+        with self._schedule_lock:
+            if any(k == key for _, k in self._schedule):
+                return
+        self._schedule_run(key, time.monotonic())
+
+    def _seconds_until_next_run(self) -> Optional[float]:
+        """ Seconds until the earliest scheduled run, or None when nothing is scheduled. """
+        with self._schedule_lock:
+            if not self._schedule:
+                return None
+            return max(0.0, self._schedule[0][0] - time.monotonic())
+
+    def _pop_due(self) -> List[str]:
+        """ Remove and return the keys of all strategies that are due now. """
+        now = time.monotonic()
+        due = []
+        with self._schedule_lock:
+            while self._schedule and self._schedule[0][0] <= now:
+                due.append(heapq.heappop(self._schedule)[1])
+        return due
     
     def _execute_all_strategies(self) -> None:
-        """ Execute all registered strategies if conditions met """
-        for key, config in self.strategies.items():
-            if not config.enabled:
+        """ Execute the strategies that are due and reschedule them """
+        ready = []
+        for key in self._pop_due():
+            # Disabled strategies drop out of the schedule here until re-enabled
+            config = self._enabled_strategies.get(key)
+            if config is None:
+                continue
+
+            if not Scheduler.is_market_open(config.asset_type):
+                self._schedule_run(key, time.monotonic() + self.MARKET_CLOSED_RECHECK_SECONDS)
                 continue
+            ready.append((key, config))
+
+        # Strategies due together share one bars request per asset type
+        prefetched = self._prefetch_bars([config for _, config in ready])
 
-            if Scheduler.should_run_strategy(
-                asset_type = config.asset_type,
-                last_run = config.last_run,
-                interval_seconds = config.interval_seconds
-            ):
-                self._execute_strategy(config)
+        for key, config in ready:
+            last_run = config.last_run
+            self._execute_strategy(config, prefetched.get((config.asset_type, config.symbol)))
+
+            # A completed cycle sets last_run; otherwise retry shortly, as the 1s poll used to
+            delay = config.interval_seconds if config.last_run is not last_run else self.RETRY_SECONDS
+            self._schedule_run(key, time.monotonic() + delay)
     
-    def _execute_strategy(self, config: StrategyConfig) -> None:
+    def _data_provider(self, asset_type: str):
+        """ Data provider serving `asset_type` ("stock" or "crypto"). """
+        if asset_type == "stock":
+            return self.data_provider_stock
+        return self.data_provider_crypto
+
+    def _prefetch_bars(self, configs: List[StrategyConfig]) -> Dict[Tuple[str, str], Bars]:
+        """
+        Fetch bars for every symbol in `configs` with one get_bars_multi call per
+        asset type, keyed by (asset_type, symbol).
+
+        Asset types with a single symbol are skipped, as is any request that
+        fails; _execute_strategy then fetches those symbols itself.
+        """
+        symbols_by_type: Dict[str, List[str]] = {}
+        for config in configs:
+            symbols = symbols_by_type.setdefault(config.asset_type, [])
+            if config.symbol not in symbols:
+                symbols.append(config.symbol)
+
+        prefetched = {}
+        for asset_type, symbols in symbols_by_type.items():
+            if len(symbols) < 2:
+                continue
+            try:
+                frames = self._data_provider(asset_type).get_bars_multi(
+                    symbols,
+                    timeframe = self.BAR_TIMEFRAME,
+                    limit = self.BAR_LIMIT,
+                    days_back = self.BAR_DAYS_BACK,
+                )
+            except Exception:
+                log.exception("Bars prefetch failed for %s", ", ".join(symbols))
+                continue
+            for symbol, frame in frames.items():
+                prefetched[(asset_type, symbol)] = Bars.from_frame(frame)
+        return prefetched
+    
+    def _execute_strategy(self, config: StrategyConfig, bars: Optional[Bars] = None) -> None:
         """
         Execute a single strategy cycle.
 
@@ -153,118 +349,115 @@ class TradingEngine:
         1. Get signal from strategy
         2. Check position exits
         3. Execute trades if signal + space available
+
+        Args:
+            config: Strategy to run
+            bars: Bars already fetched for this cycle (see _prefetch_bars);
+                fetched here when None
         """
         try:
-            if config.asset_type == "stock":
-                data_provider = self.data_provider_stock
-            else:
-                data_provider = self.data_provider_crypto
+            data_provider = self._data_provider(config.asset_type)
             
-            bars = data_provider.get_bars(
-                symbol=config.symbol,
-                timeframe="1Hour",
-                days_back=7,
-                limit=200
-            )
-
-            if bars is None or len(bars) == 0:
-                print(f"⚠ No data for {config.symbol}, skipping this cycle")
+            # Bars come back as arrays; a DataFrame is only built for strategies that need one
+            if bars is None:
+                bars = data_provider.get_bars_arrays(
+                    symbol=config.symbol,
+                    timeframe=self.BAR_TIMEFRAME,
+                    days_back=self.BAR_DAYS_BACK,
+                    limit=self.BAR_LIMIT
+                )
+            n_bars = len(bars.close)
+
+            if n_bars == 0:
+                log.warning("⚠ No data for %s, skipping this cycle", config.symbol)
                 return
             
-            print(f"{config.symbol}: Got {len(bars)} bars")
+            log.info("%s: Got %d bars", config.symbol, n_bars)
             
-            # Evaluate signal
-            signal = config.strategy.evaluate_signal(bars=bars)
-            print(f"{config.symbol}: Signal = {signal}")
+            # Evaluate signal on the latest bar
+            if _reads_closes_only(config.strategy):
+                signal = config.strategy.evaluate_signal_at(bars.close, n_bars - 1)
+            else:
+                signal = config.strategy.evaluate_signal(bars.to_frame())
+            log.info("%s: Signal = %s", config.symbol, signal_name(signal))
 
             # Check if we can open new position
             position_mgr = config.position_manager
-            current_positions = position_mgr.get_num_open_positions()
             
-            # Get account info for position sizing
-            account_summary = self.broker.get_account_summary()
-            account_value = account_summary["portfolio_value"]
+            if signal == BUY:
+                # Account value is only needed for sizing, so it's fetched on buys only
+                account_value = self._cached_account_value()
 
-            if signal == "buy":
                 # Check if we can open position
                 if position_mgr.can_open_position(account_equity=account_value):
-                    latest_price = data_provider.get_latest_price(
-                        config.symbol
-                    )
-                    print(f"{config.symbol}: Latest price = ${latest_price:.8f}")
+                    latest_price = self._latest_price(data_provider, config.symbol, bars)
+                    log.info("%s: Latest price = $%.8f", config.symbol, latest_price)
 
                     # Calculate position size
                     position_size = position_mgr.calculate_position_size(
                         account_equity=account_value,
                         entry_price=latest_price
                     )
-                    print(f"{config.symbol}: Position size = {position_size}")
+                    log.info("%s: Position size = %s", config.symbol, position_size)
 
                     if position_size > 0:
                         # Execute buy
-                        print(f"Submitting BUY order for {position_size} shares...")
+                        log.info("Submitting BUY order for %s shares...", position_size)
                         order_response = self.broker.buy(config.symbol, position_size, latest_price)
                         # Get the actual number purchases
-                        order_details = self.broker.get_order_details(order_response, config.symbol)
+                        order_details = self.broker.get_order_details(
+                            order_response, config.symbol, out = self._order_details
+                        )
                         filled_qty = order_details['filled_qty']
                         filled_price = order_details['filled_price']
                         order_status = order_details['status']
                         
-                        print(
-                            f"Order {order_status}: "
-                            f"Requested {order_details['qty_requested']}, "
-                            f"Filled {filled_qty:.8f} @ ${filled_price:.8f}"
+                        log.info(
+                            "Order %s: Requested %s, Filled %.8f @ $%.8f",
+                            order_status, order_details["qty_requested"], filled_qty, filled_price
                         )
 
                         if filled_qty > 0:
+                            self._account_value = None
                             position_mgr.open_position(
                                 symbol=config.symbol,
                                 entry_price=filled_price,
                                 qty=filled_qty
                             )
                             config.trades_this_session += 1
-                            print(
-                                f"✅ BUY: {config.symbol} x{filled_qty:.8f} "
-                                f"@ ${filled_price:.8f}"
-                            )
+                            log.info("✅ BUY: %s x%.8f @ $%.8f", config.symbol, filled_qty, filled_price)
                         else:
-                            print(
-                                f"Order not filled for {config.symbol} "
-                                f"(status: {order_status})"
-                            )
+                            log.warning("Order not filled for %s (status: %s)", config.symbol, order_status)
                 else:
-                    print(
-                        f"⚠ Cannot open position on {config.symbol} - "
-                        f"limits reached"
-                    )
+                    log.warning("⚠ Cannot open position on %s - limits reached", config.symbol)
             
-            elif signal == "sell":
-                # Close existing position if any
-                if current_positions > 0:
-                    # Verify how many shares we own
-                    position = position_mgr.open_positions[0]
-                    entry_price = position["entry_price"]
-                    entry_qty = position["qty"]
-                    print(
-                        f"Submitting SELL order for {entry_qty} shares "
-                        f"(purchased @ ${entry_price:.8f})"
+            elif signal == SELL:
+                # Close this symbol's position if any
+                position = position_mgr.get_position(config.symbol)
+                if position is not None:
+                    entry_price = position.entry_price
+                    entry_qty = position.qty
+                    log.info(
+                        "Submitting SELL order for %s shares (purchased @ $%.8f)", entry_qty, entry_price
                     )
 
                     order_response = self.broker.sell(config.symbol, entry_qty)
-                    order_details = self.broker.get_order_details(order_response, config.symbol)
+                    order_details = self.broker.get_order_details(
+                        order_response, config.symbol, out = self._order_details
+                    )
 
                     exit_qty = order_details["filled_qty"]
                     exit_price = order_details["filled_price"]
                     order_status = order_details["status"]
                     exit_time = datetime.now()
 
-                    print(
-                        f"Order {order_status}: "
-                        f"Requested {order_details['qty_requested']}, "
-                        f"Filled {exit_qty} @ ${exit_price:.8f}"
+                    log.info(
+                        "Order %s: Requested %s, Filled %s @ $%.8f",
+                        order_status, order_details["qty_requested"], exit_qty, exit_price
                     )
 
                     if exit_qty > 0:
+                        self._account_value = None
                         position_mgr.close_position(symbol = config.symbol, exit_price = exit_price)
                         pnl = (exit_price - entry_price) * exit_qty
                         pnl_percent = ((exit_price - entry_price) / entry_price) * 100
@@ -279,33 +472,22 @@ class TradingEngine:
                             exit_reason = "signal",
                             pnl = pnl,
                             pnl_percent = pnl_percent,
-                            entry_time = position["entry_date"]
+                            entry_time = position.entry_date
                         )
 
                         config.trades_this_session += 1
                         config.pnl_this_session += pnl
 
-                        print(
-                            f"SELL EXECUTED: {config.symbol} x{exit_qty} "
-                            f"@ ${exit_price:.8f}"
-                        )
-                        print(
-                            f"P&L: ${pnl:.4f} | "
-                            f"Session Total: ${config.pnl_this_session:.4f}"
-                        )
+                        log.info("SELL EXECUTED: %s x%s @ $%.8f", config.symbol, exit_qty, exit_price)
+                        log.info("P&L: $%.4f | Session Total: $%.4f", pnl, config.pnl_this_session)
                     
                     else:
-                        print(
-                            f"Sell order not filled for {config.symbol} "
-                            f"(status: {order_status})"
-                        )
+                        log.warning("Sell order not filled for %s (status: %s)", config.symbol, order_status)
             
             config.last_run = datetime.now()
 
-        except Exception as e:
-            print(f"❌ Error executing {config.symbol}: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            log.exception("❌ Error executing %s", config.symbol)
     
     def get_status(self) -> Dict:
         """
@@ -337,24 +519,53 @@ class TradingEngine:
         return status
     
     def print_status(self) -> None:
-        """ Pretty print engine status """
-        status = self.get_status()
-        print("\n" + "="*60)
-        print("TRADING ENGINE STATUS")
-        print("="*60)
-        print(f"Running: {status['is_running']}")
-        print(f"Strategies: {len(status['strategies'])}")
-        for key, info in status["strategies"].items():
-            print(f"\n  {key}:")
-            print(f"    Asset Type: {info['asset_type']}")
-            print(f"    Interval: {info['interval']}s")
-            print(f"    Last Run: {info['last_run']}")
-            print(f"    Trades: {info['trades_this_session']}")
-        print("="*60 + "\n")
+        """ Pretty print engine status, assembled into one string and written once """
+        rule = self._STATUS_RULE
+        parts = [
+            f"\n{rule}\nTRADING ENGINE STATUS\n{rule}\n"
+            f"Running: {self.is_running}\nStrategies: {len(self.strategies)}\n"
+        ]
+        for key, config in self.strategies.items():
+            parts.append(self._STATUS_STRATEGY(
+                key,
+                config.asset_type,
+                config.interval_seconds,
+                config.last_run.isoformat() if config.last_run else None,
+                config.trades_this_session,
+            ))
+        parts.append(f"{rule}\n\n")
+        sys.stdout.write("".join(parts))
     
+    def _cached_account_value(self) -> float:
+        """
+        Portfolio value for position sizing, fetched from the broker at most once
+        per ACCOUNT_VALUE_TTL seconds so strategies due in the same wave share it.
+        """
+        now = time.monotonic()
+        if self._account_value is None or now - self._account_value_at >= self.ACCOUNT_VALUE_TTL:
+            self._account_value = self.broker.get_account_summary()["portfolio_value"]
+            self._account_value_at = now
+        return self._account_value
+
+    def _latest_price(self, data_provider, symbol: str, bars: Bars) -> float:
+        """
+        Latest price for position sizing.
+
+        Uses the close of the last bar already fetched for the signal, and only
+        asks the data provider for a quote when that bar ended more than
+        LATEST_PRICE_TOLERANCE seconds ago.
+        """
+        bar_end = pd.Timestamp(bars.ts[-1]).timestamp() + self.BAR_SECONDS
+        if time.time() - bar_end <= self.LATEST_PRICE_TOLERANCE:
+            return float(bars.close[-1])
+        return data_provider.get_latest_price(symbol)
+
     def _get_actual_position_qty(self, symbol: str) -> float:
         """
-        Get the actual quantity that we hold from the broker
+        Get the actual quantity that we hold from the broker.
+
+        Positions are fetched at most once per POSITIONS_TTL seconds and kept
+        as a symbol -> qty dict.
 
         Args:
             symbol: Trading symbol (e.g., "XRP/USD")
@@ -362,13 +573,12 @@ class TradingEngine:
         Returns:
             Actual quantity held, or 0 if none
         """
-        positions = self.broker.get_positions()
-        print(positions)
-
-        normalized = symbol.replace("/", "")
+        now = time.monotonic()
+        if now - self._position_qty_at >= self.POSITIONS_TTL:
+            self._position_qty = {
+                pos["symbol"].replace("/", ""): float(pos["qty"])
+                for pos in self.broker.get_positions()
+            }
+            self._position_qty_at = now
 
-        for pos in positions:
-            if pos["symbol"] == symbol or pos ["symbol"] == normalized:
-                return float(pos['qty'])
-        
-        return 0.0
+        return self._position_qty.get(symbol.replace("/", ""), 0.0)
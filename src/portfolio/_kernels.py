@@ -0,0 +1,37 @@
+from src._njit import njit
+
+
+@njit(cache = True)
+def compute_position_params(
+        equity,
+        entry_price,
+        risk_per_trade,
+        stop_loss_pct,
+        stop_mul,
+        tp_mul,
+        max_size,
+):
+    """
+    Risk-based position size plus stop loss / take profit prices for one entry.
+
+    Args:
+        equity: Account equity
+        entry_price: Entry price per share
+        risk_per_trade, stop_loss_pct, max_size: RiskConfig values
+        stop_mul, tp_mul: RiskConfig's precomputed 1 - stop_loss_pct and 1 + take_profit_pct
+
+    Returns:
+        Tuple of (size, stop_loss_price, take_profit_price). size is
+        (equity * risk_per_trade) / (entry_price * stop_loss_pct) truncated to whole
+        units and capped at max_size (which may be fractional, e.g. 0.1 of a coin),
+        or 0.0 when the stop distance is not positive.
+    """
+    stop_loss_price = entry_price * stop_mul
+    take_profit_price = entry_price * tp_mul
+
+    stop_loss_distance = entry_price * stop_loss_pct
+    if stop_loss_distance <= 0:
+        return 0.0, stop_loss_price, take_profit_price
+
+    size = float(int(equity * risk_per_trade / stop_loss_distance))
+    return min(size, max_size), stop_loss_price, take_profit_price
@@ -1,22 +1,88 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import numpy as np
 import pandas as pd
 from .risk_config import RiskConfig
+from ._kernels import compute_position_params
 from datetime import datetime
 
 
+@dataclass(frozen = True, slots = True)
+class Position:
+    """ Snapshot of one open position, read out of PositionManager's columns. """
+    symbol: str
+    entry_price: float
+    entry_date: Any
+    qty: float
+    stop_loss_price: float
+    take_profit_price: float
+
+
 class PositionManager:
-    """Manages position sizing and tracking based on risk parameters"""
+    """
+    Manages position sizing and tracking based on risk parameters.
+
+    Open positions are stored column-wise (one NumPy array per field, rows kept
+    dense) with a symbol -> row index, so exit checks are a lookup or a single
+    vectorized comparison instead of a scan over a list of dicts.
+    """
+
+    _INITIAL_CAPACITY = 8
 
     def __init__(self, risk_config: RiskConfig):
         self.config = risk_config
-        self.open_positions = []
         self.daily_pnl = 0.0  # Track daily P&L
+
+        self._n = 0
+        self._idx: Dict[str, int] = {}
+        self._symbols = np.empty(self._INITIAL_CAPACITY, dtype = object)
+        self._entry_date = np.empty(self._INITIAL_CAPACITY, dtype = object)
+        self._entry_price = np.zeros(self._INITIAL_CAPACITY, dtype = np.float64)
+        self._qty = np.zeros(self._INITIAL_CAPACITY, dtype = np.float64)
+        self._stop = np.zeros(self._INITIAL_CAPACITY, dtype = np.float64)
+        self._tp = np.zeros(self._INITIAL_CAPACITY, dtype = np.float64)
+        # Number of buys folded into each row; counts towards max_positions_open
+        self._lots = np.zeros(self._INITIAL_CAPACITY, dtype = np.int64)
+
+    @property
+    def symbols(self) -> np.ndarray:
+        """ Symbols of the open positions, in row order (align prices for check_all_exits with this). """
+        return self._symbols[:self._n]
+
+    @property
+    def open_positions(self) -> List[Position]:
+        """ Open positions as a list of Position records (built on demand). """
+        return [self._row(i) for i in range(self._n)]
+
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """ The open position for `symbol`, or None if there is none. """
+        i = self._idx.get(symbol)
+        return self._row(i) if i is not None else None
+
+    def _row(self, i: int) -> Position:
+        return Position(
+            symbol = self._symbols[i],
+            entry_price = float(self._entry_price[i]),
+            entry_date = self._entry_date[i],
+            qty = float(self._qty[i]),
+            stop_loss_price = float(self._stop[i]),
+            take_profit_price = float(self._tp[i]),
+        )
+
+    def _grow(self) -> None:
+        """ Double the capacity of every column. """
+        capacity = 2 * len(self._symbols)
+        for name in ("_symbols", "_entry_date", "_entry_price", "_qty", "_stop", "_tp", "_lots"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype = old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
     
     def calculate_position_size(
             self,
             account_equity: float,
             entry_price: float,
-    ) -> int:
+    ) -> float:
         """
         Calculate position size based on risk.
 
@@ -29,20 +95,18 @@ class PositionManager:
         
         Returns:
             Position size (number of shares), capped at max_position_size
+            (a fractional cap such as 0.1 is returned as is)
         """
-        # Calculate stop loss distance in dollars
-        stop_loss_distance = entry_price * self.config.stop_loss_pct
-        
-        if stop_loss_distance <= 0:
-            return 0
-        
-        # Calculate how many shares we can buy with risk formula
-        risk_amount = account_equity * self.config.risk_per_trade
-        position_size = risk_amount / stop_loss_distance
-
-        # Cap at max position size
-        position_size = min(int(position_size), self.config.max_position_size)
-
+        cfg = self.config
+        position_size, _, _ = compute_position_params(
+            float(account_equity),
+            float(entry_price),
+            float(cfg.risk_per_trade),
+            float(cfg.stop_loss_pct),
+            float(cfg._stop_mul),
+            float(cfg._tp_mul),
+            float(cfg.max_position_size),
+        )
         return position_size
     
     def open_position(
@@ -52,22 +116,45 @@ class PositionManager:
             qty: int,
             entry_date: Optional[pd.Timestamp] = None
     ):
-        """Record a new open position."""
+        """
+        Record a new open position.
+
+        Buying a symbol that is already open adds to that position: quantities are
+        summed, the entry price becomes the quantity-weighted average and the stop
+        loss / take profit are recomputed from it.
+        """
         if entry_date is None:
             entry_date = datetime.now()
-        stop_loss_price = entry_price * (1 - self.config.stop_loss_pct)
-        take_profit_price = entry_price * (1 + self.config.take_profit_pct)
-
-        position = {
-            "symbol": symbol,
-            "entry_price": entry_price,
-            "entry_date": entry_date,
-            "qty": qty,
-            "stop_loss_price": stop_loss_price,
-            "take_profit_price": take_profit_price
-        }
-        self.open_positions.append(position)
-        return position
+
+        i = self._idx.get(symbol)
+        if i is None:
+            if self._n == len(self._symbols):
+                self._grow()
+            i = self._n
+            self._n += 1
+            self._idx[symbol] = i
+            self._symbols[i] = symbol
+            self._entry_date[i] = entry_date
+            self._qty[i] = 0.0
+            self._entry_price[i] = 0.0
+            self._lots[i] = 0
+
+        total_qty = self._qty[i] + qty
+        if total_qty > 0:
+            self._entry_price[i] = (self._entry_price[i] * self._qty[i] + entry_price * qty) / total_qty
+        self._qty[i] = total_qty
+        self._lots[i] += 1
+        cfg = self.config
+        _, self._stop[i], self._tp[i] = compute_position_params(
+            0.0,
+            self._entry_price[i],
+            0.0,
+            float(cfg.stop_loss_pct),
+            float(cfg._stop_mul),
+            float(cfg._tp_mul),
+            0.0,
+        )
+        return self._row(i)
     
     def can_open_position(self, account_equity: float) -> bool:
         """
@@ -100,13 +187,34 @@ class PositionManager:
 
         Returns: "stop_loss", "take_profit", or None
         """
-        for pos in self.open_positions:
-            if pos["symbol"] == symbol:
-                if current_price <= pos["stop_loss_price"]:
-                    return "stop_loss"
-                if current_price >= pos["take_profit_price"]:
-                    return "take_profit"
+        i = self._idx.get(symbol)
+        if i is None:
+            return None
+        if current_price <= self._stop[i]:
+            return "stop_loss"
+        if current_price >= self._tp[i]:
+            return "take_profit"
         return None
+
+    def check_all_exits(self, prices: np.ndarray) -> Dict[str, str]:
+        """
+        Check every open position against its stop loss and take profit at once.
+
+        Args:
+            prices: Current prices aligned with self.symbols
+
+        Returns:
+            Dict of symbol -> "stop_loss" / "take_profit" for the positions that should exit
+        """
+        n = self._n
+        prices = np.asarray(prices, dtype = np.float64)
+        stop_hit = prices <= self._stop[:n]
+        tp_hit = prices >= self._tp[:n]
+        rows = np.flatnonzero(stop_hit | tp_hit)
+        return {
+            self._symbols[i]: "stop_loss" if stop_hit[i] else "take_profit"
+            for i in rows
+        }
     
     def close_position(
             self,
@@ -120,19 +228,25 @@ class PositionManager:
             symbol: Symbol to close
             exit_price: Exit price per share
         """
-        for pos in self.open_positions:
-            if pos["symbol"] == symbol:
-                pnl = (exit_price - pos["entry_price"]) * pos["qty"]
-                self.daily_pnl += pnl
-                break
-        
-        self.open_positions = [
-            p for p in self.open_positions if p["symbol"] != symbol
-        ]
+        i = self._idx.pop(symbol, None)
+        if i is None:
+            return
+
+        self.daily_pnl += (exit_price - self._entry_price[i]) * self._qty[i]
+
+        # Move the last row into the freed slot to keep the columns dense
+        last = self._n - 1
+        if i != last:
+            for col in (self._symbols, self._entry_date, self._entry_price, self._qty, self._stop, self._tp, self._lots):
+                col[i] = col[last]
+            self._idx[self._symbols[i]] = i
+        self._symbols[last] = None
+        self._entry_date[last] = None
+        self._n = last
 
     def get_num_open_positions(self) -> int:
         """Get count of open positions"""
-        return len(self.open_positions)
+        return int(self._lots[:self._n].sum())
     
     def reset_daily_pnl(self) -> None:
         """Reset daily P&L (call at end of day)"""
@@ -1,21 +1,25 @@
+from dataclasses import dataclass, field
+
+@dataclass(frozen = True, slots = True)
 class RiskConfig:
-    """ Risk parameters for positions sizing and trade management. """
+    """
+    Risk parameters for positions sizing and trade management.
+    Immutable, so one instance can be shared by every strategy that uses it.
+    """
+    risk_per_trade: float = 0.02 # 2% of account per trade,
+    stop_loss_pct: float = 0.05 # 5% stop loss
+    take_profit_pct: float = 0.10 # 10% take profit
+    max_position_size: float = 100 # Max qty per trade (fractional for crypto)
+    max_positions_open: int = 3 # Max concurrent positions
+    max_daily_loss_pct: float = 0.05 # Max 5% loss per day
+
+    # Price multipliers for stop loss / take profit, computed once per config
+    _stop_mul: float = field(init = False, repr = False, compare = False)
+    _tp_mul: float = field(init = False, repr = False, compare = False)
 
-    def __init__(
-            self,
-            risk_per_trade: float = 0.02, # 2% of account per trade,
-            stop_loss_pct: float = 0.05, # 5% stop loss
-            take_profit_pct: float = 0.10, # 10% take profit
-            max_position_size: int = 100, # Max qty per trade
-            max_positions_open: int = 3, # Max concurrent positions
-            max_daily_loss_pct: float = 0.05, # Max 5% loss per day
-    ):
-        self.risk_per_trade = risk_per_trade
-        self.stop_loss_pct = stop_loss_pct
-        self.take_profit_pct = take_profit_pct
-        self.max_position_size = max_position_size
-        self.max_positions_open = max_positions_open
-        self.max_daily_loss_pct = max_daily_loss_pct
+    def __post_init__(self):
+        object.__setattr__(self, "_stop_mul", 1.0 - self.stop_loss_pct)
+        object.__setattr__(self, "_tp_mul", 1.0 + self.take_profit_pct)
     
     def __repr__(self):
         return (
@@ -23,4 +27,4 @@ class RiskConfig:
             f"risk={self.risk_per_trade*100:.1f}%, "
             f"stop_loss={self.stop_loss_pct*100:.1f}%, "
             f"take_profit={self.take_profit_pct*100:.1f}%)"
-        )
\ No newline at end of file
+        )
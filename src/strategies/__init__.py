@@ -0,0 +1,2 @@
+# Compile (or load from the on-disk cache) the indicator kernels once per process
+from src.strategies import _kernels
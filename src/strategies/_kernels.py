@@ -0,0 +1,239 @@
+import numpy as np
+from src._njit import njit, signatures
+
+
+@njit(signatures("int8", "float64[:], int64, int64"), cache = True)
+def sma_cross(close, short_window, long_window):
+    """
+    SMA crossover test on the last two bars.
+
+    Only the tail is read: the short / long window sums ending at the previous
+    bar are accumulated once, then rolled forward by one close (add the newest,
+    drop the oldest) for the current bar.
+
+    Args:
+        close: float64 array of closes
+        short_window, long_window: SMA lengths
+
+    Returns:
+        1 when the short SMA crosses above the long SMA, -1 when it crosses
+        below, 0 otherwise (including when there are too few closes).
+    """
+    n = close.shape[0]
+    if n < max(short_window, long_window) + 1:
+        return 0
+
+    last = n - 1
+    short_sum = 0.0
+    for k in range(last - short_window, last):
+        short_sum += close[k]
+    long_sum = 0.0
+    for k in range(last - long_window, last):
+        long_sum += close[k]
+
+    prev_short = short_sum / short_window
+    prev_long = long_sum / long_window
+    recent_short = (short_sum + close[last] - close[last - short_window]) / short_window
+    recent_long = (long_sum + close[last] - close[last - long_window]) / long_window
+
+    if prev_short < prev_long and recent_short > recent_long:
+        return 1
+    if prev_short > prev_long and recent_short < recent_long:
+        return -1
+    return 0
+
+
+@njit(signatures("UniTuple(float64, 3)", "float64[:], int64, float64"), cache = True)
+def bollinger_last(close, n, k):
+    """
+    Bollinger bands of the last bar only.
+
+    Mean and sample standard deviation (ddof = 1) are taken over the last n
+    closes. The deviation is accumulated around the mean (two passes over the
+    window) rather than from a sum of squares, which loses precision on large
+    prices with a small spread.
+
+    Args:
+        close: float64 array of closes, at least n long
+        n: Window length
+        k: Band width in standard deviations
+
+    Returns:
+        Tuple of (last close, lower band, upper band). Bands are NaN when
+        n < 2 or the window contains a NaN.
+    """
+    last = close.shape[0] - 1
+    price = close[last]
+    if n < 2:
+        return price, np.nan, np.nan
+
+    total = 0.0
+    for j in range(last - n + 1, last + 1):
+        total += close[j]
+    mean = total / n
+
+    sq_dev = 0.0
+    for j in range(last - n + 1, last + 1):
+        d = close[j] - mean
+        sq_dev += d * d
+    std = np.sqrt(sq_dev / (n - 1))
+
+    return price, mean - k * std, mean + k * std
+
+
+@njit(signatures("float64[:]", "float64[:], int64"), cache = True)
+def rsi_series(close, period):
+    """
+    Wilder RSI for every bar, in one pass.
+
+    Average gain / loss are seeded with the mean of the first `period` price
+    changes and then smoothed with alpha = 1 / period, as in Wilder's (and
+    TA-Lib's) definition.
+
+    Args:
+        close: float64 array of closes
+        period: RSI length
+
+    Returns:
+        float64 array the same length as close; NaN during the first `period`
+        bars and wherever there was no price change to average.
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n < period + 1:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = close[i] - close[i - 1]
+        if d > 0:
+            avg_gain += d
+        else:
+            avg_loss -= d
+    avg_gain /= period
+    avg_loss /= period
+
+    # Smoothing coefficients, hoisted out of the loop
+    alpha = 1.0 / period
+    decay = 1.0 - alpha
+
+    for i in range(period, n):
+        if i > period:
+            d = close[i] - close[i - 1]
+            avg_gain = alpha * (d if d > 0 else 0.0) + decay * avg_gain
+            avg_loss = alpha * (-d if d < 0 else 0.0) + decay * avg_loss
+        total = avg_gain + avg_loss
+        if total != 0:
+            out[i] = 100.0 * avg_gain / total
+    return out
+
+
+@njit(signatures("float64", "float64[:], int64"), cache = True)
+def rsi_last(close, period):
+    """
+    Wilder RSI of the last bar: the last value of rsi_series.
+
+    Args:
+        close: float64 array of closes
+        period: RSI length
+
+    Returns:
+        RSI in [0, 100], or NaN with fewer than period + 1 closes or no price change.
+    """
+    if close.shape[0] < period + 1:
+        return np.nan
+    return rsi_series(close, period)[-1]
+
+
+@njit(signatures("UniTuple(float64[:], 2)", "float64[:], int64, int64, int64"), cache = True)
+def macd_series(close, fast, slow, signal):
+    """
+    MACD and signal lines for every bar, in one pass.
+
+    EMAs follow pandas_ta / TA-Lib: each is seeded with the SMA of its first
+    `length` inputs, then updated with alpha = 2 / (length + 1). The signal
+    line is the same EMA over the MACD line from its first valid value.
+
+    Args:
+        close: float64 array of closes
+        fast, slow, signal: EMA lengths
+
+    Returns:
+        Tuple of (macd, signal_line) float64 arrays the same length as close,
+        NaN until each line has a value.
+    """
+    n = close.shape[0]
+    macd_out = np.full(n, np.nan)
+    signal_out = np.full(n, np.nan)
+    macd_start = max(fast, slow) - 1
+    signal_start = macd_start + signal - 1
+
+    # Smoothing coefficients, hoisted out of the loop
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    decay_fast = 1.0 - alpha_fast
+    decay_slow = 1.0 - alpha_slow
+    decay_signal = 1.0 - alpha_signal
+
+    ema_fast = 0.0
+    ema_slow = 0.0
+    signal_line = 0.0
+
+    for i in range(n):
+        x = close[i]
+        if i < fast:
+            ema_fast += x
+            if i == fast - 1:
+                ema_fast /= fast
+        else:
+            ema_fast = alpha_fast * x + decay_fast * ema_fast
+
+        if i < slow:
+            ema_slow += x
+            if i == slow - 1:
+                ema_slow /= slow
+        else:
+            ema_slow = alpha_slow * x + decay_slow * ema_slow
+
+        if i < macd_start:
+            continue
+
+        macd = ema_fast - ema_slow
+        macd_out[i] = macd
+        if i < signal_start:
+            signal_line += macd
+            continue
+        if i == signal_start:
+            signal_line = (signal_line + macd) / signal
+        else:
+            signal_line = alpha_signal * macd + decay_signal * signal_line
+        signal_out[i] = signal_line
+    return macd_out, signal_out
+
+
+@njit(signatures("int8", "float64[:], int64, int64, int64"), cache = True)
+def macd_cross(close, fast, slow, signal):
+    """
+    MACD / signal-line crossover test on the last two bars of macd_series.
+
+    Args:
+        close: float64 array of closes
+        fast, slow, signal: EMA lengths
+
+    Returns:
+        1 when MACD crosses above the signal line, -1 when it crosses below,
+        0 otherwise (including when there are too few closes).
+    """
+    if close.shape[0] < max(fast, slow) + signal:
+        return 0
+    macd, signal_line = macd_series(close, fast, slow, signal)
+    prev_macd, prev_signal = macd[-2], signal_line[-2]
+    recent_macd, recent_signal = macd[-1], signal_line[-1]
+
+    if prev_macd < prev_signal and recent_macd > recent_signal:
+        return 1
+    if prev_macd > prev_signal and recent_macd < recent_signal:
+        return -1
+    return 0
@@ -0,0 +1,338 @@
+"""
+Incremental indicator state for live strategy ticks.
+
+On the first run_once a strategy fetches its usual history and folds it into
+one of the streams below; later ticks only fetch the last few bars and fold
+in the new ones, instead of refetching and recomputing the whole window.
+
+The newest bar may still be forming, so a stream only *commits* bars before
+it and evaluates the newest bar with peek(), which doesn't change the state.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+import math
+import numpy as np
+import pandas as pd
+
+from src.strategies.signal import SELL, HOLD, BUY
+
+# Bars requested per tick once warmed up; only the last two are used
+STREAM_FETCH_LIMIT = 10
+
+
+@dataclass
+class EMAState:
+    """
+    Exponential moving average seeded with the SMA of its first `length`
+    inputs (pandas_ta / TA-Lib style). NaN until `length` inputs are pushed.
+    """
+    length: int
+    alpha: float
+    decay: float = field(init = False, repr = False)
+    value: float = np.nan
+    count: int = 0
+    seed_sum: float = 0.0
+
+    def __post_init__(self):
+        # Weight of the previous value, computed once per stream
+        self.decay = 1.0 - self.alpha
+
+    @classmethod
+    def span(cls, length: int) -> "EMAState":
+        """ EMA with alpha = 2 / (length + 1) """
+        return cls(length, 2.0 / (length + 1))
+
+    @classmethod
+    def wilder(cls, length: int) -> "EMAState":
+        """ Wilder smoothing, alpha = 1 / length """
+        return cls(length, 1.0 / length)
+
+    def peek(self, x: float) -> float:
+        """ Value after `x`, without consuming it. """
+        count = self.count + 1
+        if count < self.length:
+            return np.nan
+        if count == self.length:
+            return (self.seed_sum + x) / self.length
+        return self.alpha * x + self.decay * self.value
+
+    def push(self, x: float) -> float:
+        """ Consume `x` and return the new value. """
+        self.value = self.peek(x)
+        self.count += 1
+        if self.count < self.length:
+            self.seed_sum += x
+        return self.value
+
+
+@dataclass
+class RollingSumState:
+    """ Last `length` inputs and their running sum. """
+    length: int
+    buf: deque = field(init = False)
+    total: float = 0.0
+
+    def __post_init__(self):
+        self.buf = deque(maxlen = self.length)
+
+    @property
+    def full(self) -> bool:
+        return len(self.buf) == self.length
+
+    def push(self, x: float) -> None:
+        if self.full:
+            self.total -= self.buf[0]
+        self.buf.append(x)
+        self.total += x
+
+    def peek_sum(self, x: float) -> float:
+        """ Sum of the window ending at `x`, without consuming it. """
+        return self.total + x - (self.buf[0] if self.full else 0.0)
+
+
+@dataclass
+class RollingMomentsState:
+    """
+    Last `length` inputs with a running sum and sum of squares, for a rolling
+    mean and sample variance in O(1) per bar.
+
+    Inputs are shifted by the first value pushed, so the sums stay small for
+    large prices with a small spread and the variance keeps its precision.
+    """
+    length: int
+    buf: deque = field(init = False)
+    shift: float = np.nan
+    total: float = 0.0
+    sq_total: float = 0.0
+
+    def __post_init__(self):
+        self.buf = deque(maxlen = self.length)
+
+    @property
+    def full(self) -> bool:
+        return len(self.buf) == self.length
+
+    def push(self, x: float) -> None:
+        if math.isnan(self.shift):
+            self.shift = x
+        if self.full:
+            d = self.buf[0]
+            self.total -= d
+            self.sq_total -= d * d
+        d = x - self.shift
+        self.buf.append(d)
+        self.total += d
+        self.sq_total += d * d
+
+    def peek_mean_std(self, x: float):
+        """ Mean and sample std (ddof = 1) of the `length` + 1 window ending at `x`, without consuming it. """
+        n = len(self.buf) + 1
+        shift = x if math.isnan(self.shift) else self.shift
+        d = x - shift
+        total = self.total + d
+        sq_total = self.sq_total + d * d
+        var = max(sq_total - total * total / n, 0.0) / (n - 1)
+        return shift + total / n, math.sqrt(var)
+
+
+class IndicatorStream(ABC):
+    """
+    Base for per-strategy streaming state. Subclasses implement reset(),
+    push(close) for a committed bar, and peek(close) -> signal for the newest bar.
+    """
+
+    def __init__(self):
+        self.committed_ts = None
+        self.peek_ts = None
+
+    @abstractmethod
+    def reset(self) -> None:
+        """ Drop all state, ready for a rebuild from full history. """
+        pass
+
+    @abstractmethod
+    def push(self, close: float) -> None:
+        """ Fold in the close of a completed bar. """
+        pass
+
+    @abstractmethod
+    def peek(self, close: float) -> int:
+        """ Signal for the newest (possibly forming) bar, without changing the state. """
+        pass
+
+    def signal(self, fetch: Callable[..., pd.DataFrame]) -> int:
+        """
+        Advance the state with new bars and return the signal for the newest one.
+
+        Args:
+            fetch: The strategy's bar fetcher; fetch() returns its full
+                history window, fetch(STREAM_FETCH_LIMIT) a short recent one.
+        """
+        if self.committed_ts is not None:
+            bars = fetch(STREAM_FETCH_LIMIT)
+            if bars is not None and len(bars) >= 2:
+                ts = bars.index[-2:]
+                closes = bars["close"].to_numpy(dtype = np.float64)[-2:]
+                # Last tick's newest bar is now complete: commit it
+                if ts[0] == self.peek_ts:
+                    self.push(closes[0])
+                    self.committed_ts = ts[0]
+                if ts[0] == self.committed_ts:
+                    self.peek_ts = ts[1]
+                    return self.peek(closes[1])
+
+        # First tick, or bars were missed since the last one: rebuild from full history
+        bars = fetch()
+        self.reset()
+        self.committed_ts = self.peek_ts = None
+        if bars is None or bars.empty:
+            return HOLD
+
+        closes = bars["close"].to_numpy(dtype = np.float64)
+        for close in closes[:-1]:
+            self.push(close)
+        if len(closes) >= 2:
+            self.committed_ts = bars.index[-2]
+        self.peek_ts = bars.index[-1]
+        return self.peek(closes[-1])
+
+
+class SMACrossStream(IndicatorStream):
+    """ Short / long SMA crossover. """
+
+    def __init__(self, short_window: int, long_window: int):
+        super().__init__()
+        self.short_window = short_window
+        self.long_window = long_window
+        self.reset()
+
+    def reset(self) -> None:
+        self.short = RollingSumState(self.short_window)
+        self.long = RollingSumState(self.long_window)
+
+    def push(self, close: float) -> None:
+        self.short.push(close)
+        self.long.push(close)
+
+    def peek(self, close: float) -> int:
+        if not (self.short.full and self.long.full):
+            return HOLD
+        prev_short = self.short.total / self.short_window
+        prev_long = self.long.total / self.long_window
+        recent_short = self.short.peek_sum(close) / self.short_window
+        recent_long = self.long.peek_sum(close) / self.long_window
+
+        if prev_short < prev_long and recent_short > recent_long:
+            return BUY
+        if prev_short > prev_long and recent_short < recent_long:
+            return SELL
+        return HOLD
+
+
+class BollingerStream(IndicatorStream):
+    """ Price against mean +/- k std bands of the last `lookback` closes. """
+
+    def __init__(self, lookback: int, threshold: float):
+        super().__init__()
+        self.lookback = lookback
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self) -> None:
+        # The newest close completes the window, so lookback - 1 are kept
+        self.window = RollingMomentsState(max(self.lookback - 1, 0))
+
+    def push(self, close: float) -> None:
+        self.window.push(close)
+
+    def peek(self, close: float) -> int:
+        if self.lookback < 2 or not self.window.full:
+            return HOLD
+        mean, std = self.window.peek_mean_std(close)
+        # NaN bands (a NaN close in the window) compare False and hold
+        if close < mean - self.threshold * std:
+            return BUY
+        if close > mean + self.threshold * std:
+            return SELL
+        return HOLD
+
+
+class RSIStream(IndicatorStream):
+    """ Wilder RSI against oversold / overbought thresholds. """
+
+    def __init__(self, period: int, oversold: float, overbought: float):
+        super().__init__()
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+        self.reset()
+
+    def reset(self) -> None:
+        self.gain = EMAState.wilder(self.period)
+        self.loss = EMAState.wilder(self.period)
+        self.last_close = None
+
+    def push(self, close: float) -> None:
+        if self.last_close is not None:
+            d = close - self.last_close
+            self.gain.push(max(d, 0.0))
+            self.loss.push(max(-d, 0.0))
+        self.last_close = close
+
+    def peek(self, close: float) -> int:
+        if self.last_close is None:
+            return HOLD
+        d = close - self.last_close
+        avg_gain = self.gain.peek(max(d, 0.0))
+        avg_loss = self.loss.peek(max(-d, 0.0))
+        total = avg_gain + avg_loss
+        if not total > 0:
+            return HOLD
+
+        rsi = 100.0 * avg_gain / total
+        if rsi < self.oversold:
+            return BUY
+        if rsi > self.overbought:
+            return SELL
+        return HOLD
+
+
+class MACDStream(IndicatorStream):
+    """ MACD / signal-line crossover. """
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        super().__init__()
+        self.fast = fast
+        self.slow = slow
+        self.signal_length = signal
+        self.reset()
+
+    def reset(self) -> None:
+        self.ema_fast = EMAState.span(self.fast)
+        self.ema_slow = EMAState.span(self.slow)
+        self.signal_line = EMAState.span(self.signal_length)
+        self.macd = np.nan
+        # MACD is NaN only until both EMAs are seeded; after that the NaN tests are skipped
+        self.warmed_up = False
+
+    def push(self, close: float) -> None:
+        self.macd = self.ema_fast.push(close) - self.ema_slow.push(close)
+        if self.warmed_up or not math.isnan(self.macd):
+            self.warmed_up = True
+            self.signal_line.push(self.macd)
+
+    def peek(self, close: float) -> int:
+        macd = self.ema_fast.peek(close) - self.ema_slow.peek(close)
+        if not self.warmed_up and math.isnan(macd):
+            return HOLD
+        signal_line = self.signal_line.peek(macd)
+        prev_macd, prev_signal = self.macd, self.signal_line.value
+
+        # NaN comparisons are False, so an unseeded signal line holds
+        if prev_macd < prev_signal and macd > signal_line:
+            return BUY
+        if prev_macd > prev_signal and macd < signal_line:
+            return SELL
+        return HOLD
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from src.brokers.base_broker import BaseBroker
 from typing import Optional
+import numpy as np
 import pandas as pd
 
+from src.strategies.signal import SELL, HOLD, BUY
+
 class BaseStrategy(ABC):
     """
     Abstract base class for all trading strategies
@@ -15,18 +18,57 @@ class BaseStrategy(ABC):
         self.symbol = symbol
 
     @abstractmethod
-    def evaluate_signal(self, bars: Optional[pd.DataFrame] = None) -> str:
+    def evaluate_signal(self, bars: Optional[pd.DataFrame] = None) -> int:
         """
         Determine trading signal.
 
-        Should return one of: "buy", "sell", "hold"
+        Should return one of the signal codes: BUY, SELL, HOLD
         This method **does not** actually execute trades;
         it only decides *what* should be done
+
+        `bars` may share memory with the caller's data and must be treated
+        as read-only; copy it first if indicator columns need to be added.
         """
         pass
 
+    def evaluate_signal_at(self, closes: np.ndarray, i: int) -> int:
+        """
+        Determine trading signal at bar `i` of a precomputed close array.
+
+        Used by the BacktestEngine so it doesn't have to slice and copy the
+        bar DataFrame on every bar. The default wraps closes[:i + 1] and
+        defers to evaluate_signal(); strategies can override this with an
+        index-based version. `closes` must be treated as read-only.
+        """
+        # The window is a view over closes, not a per-bar copy (see evaluate_signal contract)
+        return self.evaluate_signal(pd.DataFrame({"close": closes[: i + 1]}, copy = False))
+
+    def compute_signals(self, bars: pd.DataFrame, start: int = 0) -> np.ndarray:
+        """
+        Compute a signal for every bar in one call.
+
+        Returns an int8 array the same length as `bars`
+        of HOLD / BUY / SELL codes; bars before `start` are left as HOLD.
+        The default loops over evaluate_signal_at(); strategies whose
+        indicators can be computed over the whole series at once should
+        override this.
+        """
+        closes = self._closes(bars)
+        signals = np.zeros(len(closes), dtype = np.int8)
+        for i in range(start, len(closes)):
+            signals[i] = self.evaluate_signal_at(closes, i)
+        return signals
+
+    @staticmethod
+    def _closes(bars: pd.DataFrame) -> np.ndarray:
+        """
+        Close column as a float64 array, without copying when it already is one.
+        Strategies run their kernels on this instead of adding indicator columns.
+        """
+        return bars["close"].to_numpy(dtype = np.float64, copy = False)
+
     @abstractmethod
-    def execute_trade(self, signal: str):
+    def execute_trade(self, signal: int):
         """
         Executes a trade via the broker based on a given signal
 
@@ -1,7 +1,10 @@
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, HOLD, BUY, signal_name
 from src.data.base_data_provider import BaseDataProvider
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from src.strategies._kernels import macd_cross, macd_series
+from src.strategies._stream_state import MACDStream
 
 class MACDStrategy(BaseStrategy):
     """
@@ -26,6 +29,9 @@ class MACDStrategy(BaseStrategy):
         self.fast = fast
         self.slow = slow
         self.signal = signal
+
+        # Incremental state for live run_once ticks
+        self._live = MACDStream(fast, slow, signal)
     
     def _get_recent_data(self, bars_back: int = 100) -> pd.DataFrame:
         """ Fetch recent bars for indicator calculation """
@@ -34,40 +40,61 @@ class MACDStrategy(BaseStrategy):
         )
         return data
     
-    def evaluate_signal(self, bars: pd.DataFrame = None) -> str:
+    def evaluate_signal(self, bars: pd.DataFrame = None) -> int:
         """
         Evaluate MACD crossovers.
 
         Args:
             bars: Optional DataFrame of bars. If None, fetch from data_provider
         Returns:
-            "buy", "sell", or "hold"
+            BUY, SELL or HOLD
         """
         if bars is None:
-            bars = self._get_recent_data()
+            # Live tick: fold new bars into the incremental state
+            return self._live.signal(self._get_recent_data)
         
-        if bars is None or len(bars) < self.slow + self.signal:
-            return "hold"
+        if len(bars) < self.slow + self.signal:
+            return HOLD
         
-        df = bars.copy()
-        macd_df = ta.macd(df["close"], fast = self.fast, slow = self.slow, signal = self.signal)
-
-        df["macd"] = macd_df.iloc[:, 0]
-        df["signal_line"] = macd_df.iloc[:, 1]
+        # Bullish cross: MACD below then above signal; bearish: above then below.
+        # macd_cross codes (-1 / 0 / 1) are the SELL / HOLD / BUY signals
+        return macd_cross(self._closes(bars), self.fast, self.slow, self.signal)
+    
+    @classmethod
+    def vectorized_signals(
+            cls,
+            close: np.ndarray,
+            fast: int = 12,
+            slow: int = 26,
+            signal: int = 9,
+    ) -> np.ndarray:
+        """
+        MACD crossover signals for every bar of `close`.
 
-        # Check latest two points for crossover
-        recent = df.iloc[-1]
-        prev = df.iloc[-2]
+        The MACD and signal lines come from one compiled EMA pass; crossovers
+        are then found by comparing each bar with the previous one.
 
-        if pd.notna(prev["macd"]) and pd.notna(prev["signal_line"]):
-            # Bullish cross: MACD below then above signal
-            if prev.macd < prev.signal_line and recent.macd > recent.signal_line:
-                return "buy"
-            # Bearish: MACD above then below signal
-            if prev.macd > prev.signal_line and recent.macd < recent.signal_line:
-                return "sell"
+        Returns:
+            int8 array of HOLD / BUY / SELL codes the same length as close
+            (HOLD during warmup).
+        """
+        macd, signal_line = macd_series(np.asarray(close, dtype = np.float64), fast, slow, signal)
+        signals = np.zeros(len(macd), dtype = np.int8)
+        # NaN comparisons are False, so warmup bars stay hold
+        buy = (macd[:-1] < signal_line[:-1]) & (macd[1:] > signal_line[1:])
+        sell = (macd[:-1] > signal_line[:-1]) & (macd[1:] < signal_line[1:])
+        signals[1:][buy] = BUY
+        signals[1:][sell] = SELL
+        signals[: slow + signal - 1] = HOLD
+        return signals
 
-        return "hold"
+    def compute_signals(self, bars: pd.DataFrame, start: int = 0) -> np.ndarray:
+        """ Whole-series signals via vectorized_signals(); bars before `start` are HOLD. """
+        signals = self.vectorized_signals(
+            self._closes(bars), self.fast, self.slow, self.signal
+        )
+        signals[:start] = HOLD
+        return signals
     
-    def execute_trade(self, signal: str):
-        print(f"{self.symbol}: MACD signal = {signal}")
\ No newline at end of file
+    def execute_trade(self, signal: int):
+        print(f"{self.symbol}: MACD signal = {signal_name(signal)}")
\ No newline at end of file
@@ -1,7 +1,10 @@
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, HOLD, BUY, signal_name
 from src.data.base_data_provider import BaseDataProvider
 import pandas as pd
 import numpy as np
+from src.strategies._kernels import bollinger_last
+from src.strategies._stream_state import BollingerStream
 
 class MeanReversionStrategy(BaseStrategy):
     """
@@ -24,43 +27,94 @@ class MeanReversionStrategy(BaseStrategy):
         self.lookback = lookback
         self.threshold = threshold
 
+        # Incremental state for live run_once ticks
+        self._live = BollingerStream(lookback, threshold)
+
     def _get_recent_data(self, bars_back: int = None) -> pd.DataFrame:
         limit = max(self.lookback + 5, 40) if bars_back is None else bars_back
         return self.data_provider.get_bars(self.symbol, "1Day", limit = limit)
     
-    def evaluate_signal(self, bars: pd.DataFrame = None) -> str:
+    def evaluate_signal(self, bars: pd.DataFrame = None) -> int:
         """
         Evaluate mean reversion condition on bars.
 
         Returns:
-            "buy", "sell", or "hold"
+            BUY, SELL or HOLD
         """
         if bars is None:
-            bars = self._get_recent_data()
-        
-        if bars is None or len(bars) < self.lookback:
-            return "hold"
+            # Live tick: fold new bars into the incremental state
+            return self._live.signal(self._get_recent_data)
         
-        df = bars.copy()
-        df["sma"] = df["close"].rolling(window = self.lookback).mean()
-        df["std"] = df["close"].rolling(window = self.lookback).std()
-        df.dropna(inplace = True)
-
-        if len(df) == 0:
-            return "hold"
+        if len(bars) < self.lookback:
+            return HOLD
         
-        latest = df.iloc[-1]
-        price = latest["close"]
-        lower_band = latest["sma"] - self.threshold * latest["std"]
-        upper_band = latest["sma"] + self.threshold * latest["std"]
+        price, lower_band, upper_band = bollinger_last(
+            self._closes(bars), self.lookback, self.threshold
+        )
 
         # contrarian logic
         if price < lower_band:
-            return "buy"
+            return BUY
         elif price > upper_band:
-            return "sell"
+            return SELL
+        
+        return HOLD
+    
+    def evaluate_signal_at(self, closes: np.ndarray, i: int) -> int:
+        """
+        Index-based mean reversion check for backtesting.
+
+        Only reads the last `lookback` closes up to bar i.
+        """
+        if i + 1 < self.lookback or self.lookback < 2:
+            return HOLD
+        
+        window = closes[i - self.lookback + 1 : i + 1]
+        sma = window.mean()
+        std = window.std(ddof = 1)
+        price = closes[i]
+
+        if price < sma - self.threshold * std:
+            return BUY
+        elif price > sma + self.threshold * std:
+            return SELL
         
-        return "hold"
+        return HOLD
+    
+    @classmethod
+    def vectorized_signals(cls, close: np.ndarray, lookback: int = 20, threshold: float = 1.5) -> np.ndarray:
+        """
+        Band signals for every bar of `close` as one array expression.
+
+        Rolling mean and sample std (ddof = 1) come from a sliding window view,
+        then close < sma - threshold * std is a buy and close > sma + threshold * std a sell.
+
+        Returns:
+            int8 array of HOLD / BUY / SELL codes the same length as close
+            (HOLD during warmup).
+        """
+        close = np.asarray(close, dtype = np.float64)
+        signals = np.zeros(len(close), dtype = np.int8)
+        if len(close) < lookback or lookback < 2:
+            return signals
+
+        windows = np.lib.stride_tricks.sliding_window_view(close, lookback)
+        sma = windows.mean(axis = 1)
+        std = windows.std(axis = 1, ddof = 1)
+        price = close[lookback - 1:]
+
+        tail = signals[lookback - 1:]
+        tail[price < sma - threshold * std] = BUY
+        tail[price > sma + threshold * std] = SELL
+        return signals
+
+    def compute_signals(self, bars: pd.DataFrame, start: int = 0) -> np.ndarray:
+        """ Whole-series signals via vectorized_signals(); bars before `start` are HOLD. """
+        signals = self.vectorized_signals(
+            self._closes(bars), self.lookback, self.threshold
+        )
+        signals[:start] = HOLD
+        return signals
     
-    def execute_trade(self, signal: str):
-        print(f"{self.symbol}: MeanReversion signal = {signal}")
\ No newline at end of file
+    def execute_trade(self, signal: int):
+        print(f"{self.symbol}: MeanReversion signal = {signal_name(signal)}")
\ No newline at end of file
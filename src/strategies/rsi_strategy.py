@@ -1,7 +1,10 @@
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, HOLD, BUY, signal_name
 from src.data.base_data_provider import BaseDataProvider
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from src.strategies._kernels import rsi_last, rsi_series
+from src.strategies._stream_state import RSIStream
 
 class RSIStrategy(BaseStrategy):
     """
@@ -26,6 +29,9 @@ class RSIStrategy(BaseStrategy):
         self.period = period
         self.overbought = overbought
         self.oversold = oversold
+
+        # Incremental state for live run_once ticks
+        self._live = RSIStream(period, oversold, overbought)
     
     def _get_recent_data(self, bars_back: int = 100) -> pd.DataFrame:
         """ Fetch recent bars (default 100) for indicator calculation. """
@@ -34,35 +40,66 @@ class RSIStrategy(BaseStrategy):
         )
         return data
     
-    def evaluate_signal(self, bars: pd.DataFrame = None) -> str:
+    def evaluate_signal(self, bars: pd.DataFrame = None) -> int:
         """
         Evaluate RSI crossover conditions.
 
         Args:
             bars: Optional market data DataFrame for backtesting
         Returns:
-            "buy", "sell", or "hold"
+            BUY, SELL or HOLD
         """
         if bars is None:
-            bars = self._get_recent_data()
+            # Live tick: fold new bars into the incremental state
+            return self._live.signal(self._get_recent_data)
         
-        if bars is None or len(bars) < self.period + 1:
-            return "hold"
+        if len(bars) < self.period + 1:
+            return HOLD
         
-        df = bars.copy()
-        df['rsi'] = ta.rsi(df['close'], length = self.period)
-
-        latest_rsi = df['rsi'].iloc[-1]
+        latest_rsi = rsi_last(self._closes(bars), self.period)
 
         if latest_rsi < self.oversold:
-            return "buy"
+            return BUY
         elif latest_rsi > self.overbought:
-            return "sell"
+            return SELL
         
-        return "hold"
+        return HOLD
+    
+    @classmethod
+    def vectorized_signals(
+            cls,
+            close: np.ndarray,
+            period: int = 14,
+            overbought: int = 70,
+            oversold: int = 30,
+    ) -> np.ndarray:
+        """
+        RSI signals for every bar of `close`.
+
+        The RSI series comes from one compiled Wilder pass; the thresholds are
+        then applied as boolean arrays.
+
+        Returns:
+            int8 array of HOLD / BUY / SELL codes the same length as close
+            (HOLD during warmup).
+        """
+        rsi = rsi_series(np.asarray(close, dtype = np.float64), period)
+        signals = np.zeros(len(rsi), dtype = np.int8)
+        # NaN RSI (warmup / flat prices) compares False and stays hold
+        signals[rsi < oversold] = BUY
+        signals[rsi > overbought] = SELL
+        return signals
+
+    def compute_signals(self, bars: pd.DataFrame, start: int = 0) -> np.ndarray:
+        """ Whole-series signals via vectorized_signals(); bars before `start` are HOLD. """
+        signals = self.vectorized_signals(
+            self._closes(bars), self.period, self.overbought, self.oversold
+        )
+        signals[:start] = HOLD
+        return signals
     
-    def execute_trade(self, signal: str):
+    def execute_trade(self, signal: int):
         """
         TradingEngine will handle execution
         """
-        print(f"{self.symbol}: RSI signal = {signal}")
\ No newline at end of file
+        print(f"{self.symbol}: RSI signal = {signal_name(signal)}")
\ No newline at end of file
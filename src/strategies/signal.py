@@ -0,0 +1,15 @@
+"""
+Integer trading signal codes.
+
+Strategies return one of these from evaluate_signal() rather than
+"buy" / "sell" / "hold"; the names are only looked up where a signal is
+printed or logged. Precomputed signal arrays use the same codes as int8.
+"""
+
+SELL, HOLD, BUY = -1, 0, 1
+
+SIGNAL_NAMES = {SELL: "sell", HOLD: "hold", BUY: "buy"}
+
+def signal_name(signal: int) -> str:
+    """ Printable name of a signal code. """
+    return SIGNAL_NAMES.get(signal, "hold")
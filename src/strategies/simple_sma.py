@@ -1,6 +1,10 @@
 # src/strategies/simple_sma.py
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, HOLD, BUY, signal_name
+import numpy as np
 import pandas as pd
+from src.strategies._kernels import sma_cross
+from src.strategies._stream_state import SMACrossStream
 
 class SimpleSMA(BaseStrategy):
     def __init__(self, broker, symbol, data_provider, short_window=5, long_window=20):
@@ -9,11 +13,19 @@ class SimpleSMA(BaseStrategy):
         self.short_window = short_window
         self.long_window = long_window
 
-    def _get_recent_data(self) -> pd.DataFrame:
-        limit = max(self.long_window + 5, 40)
+        # Incremental state for live run_once ticks
+        self._live = SMACrossStream(short_window, long_window)
+
+        # Same state, replayed bar by bar over a close array by evaluate_signal_at
+        self._replay = SMACrossStream(short_window, long_window)
+        self._replay_closes = None
+        self._replay_i = -1
+
+    def _get_recent_data(self, bars_back: int = None) -> pd.DataFrame:
+        limit = max(self.long_window + 5, 40) if bars_back is None else bars_back
         return self.data.get_bars(self.symbol, "1Day", limit=limit)
 
-    def evaluate_signal(self, bars: pd.DataFrame = None) -> str:
+    def evaluate_signal(self, bars: pd.DataFrame = None) -> int:
         """
         Evaluate SMA crossover signal.
 
@@ -22,27 +34,72 @@ class SimpleSMA(BaseStrategy):
                 Used during backtesting to provide bar context
         """
         if bars is None:
-            data = self._get_recent_data()
+            # Live tick: fold new bars into the incremental state
+            return self._live.signal(self._get_recent_data)
+
+        if bars.empty:
+            return HOLD
+
+        # sma_cross codes (-1 / 0 / 1) are the SELL / HOLD / BUY signals
+        return sma_cross(self._closes(bars), self.short_window, self.long_window)
+
+    def evaluate_signal_at(self, closes: np.ndarray, i: int) -> int:
+        """
+        Index-based SMA crossover for backtesting.
+
+        When called bar after bar on the same array (as ensembles do) this
+        advances an SMACrossStream, the same state the live ticks use, in O(1)
+        per bar; otherwise the state is rebuilt from the long window before i.
+        """
+        if i < self.long_window:
+            return HOLD
+
+        stream = self._replay
+        if closes is self._replay_closes and i == self._replay_i + 1:
+            stream.push(closes[i - 1])
         else:
-            data = bars.copy()
-        
-        if data.empty or len(data) < self.long_window + 1:
-            return "hold"
-        
-        data['sma_short'] = data['close'].rolling(self.short_window).mean()
-        data['sma_long'] = data['close'].rolling(self.long_window).mean()
-
-        recent = data.iloc[-1]
-        prev = data.iloc[-2]
-
-        if pd.notna(prev.sma_short) and pd.notna(prev.sma_long):
-            # Short window SMA crosses above long window SMA = BUY
-            if prev.sma_short < prev.sma_long and recent.sma_short > recent.sma_long:
-                return "buy"
-            # Short window SMA crosses below long window SMA = SELL
-            if prev.sma_short > prev.sma_long and recent.sma_short < recent.sma_long:
-                return "sell"
-        return "hold"
-
-    def execute_trade(self, signal: str):
-        print(f"{self.symbol}: Simple SMA signal = {signal}")
\ No newline at end of file
+            stream.reset()
+            for close in closes[i - self.long_window:i]:
+                stream.push(close)
+            self._replay_closes = closes
+        self._replay_i = i
+        return stream.peek(closes[i])
+
+    @classmethod
+    def vectorized_signals(cls, close: np.ndarray, short_window: int = 5, long_window: int = 20) -> np.ndarray:
+        """
+        Crossover signals for every bar of `close` in one pass.
+
+        Both SMAs are computed once with np.convolve over the whole series.
+
+        Returns:
+            int8 array of HOLD / BUY / SELL codes the same length as close
+            (HOLD during warmup).
+        """
+        close = np.asarray(close, dtype = np.float64)
+        n = len(close)
+        fast = np.full(n, np.nan)
+        slow = np.full(n, np.nan)
+        if n >= short_window:
+            fast[short_window - 1:] = np.convolve(close, np.ones(short_window), "valid") / short_window
+        if n >= long_window:
+            slow[long_window - 1:] = np.convolve(close, np.ones(long_window), "valid") / long_window
+
+        signals = np.zeros(n, dtype = np.int8)
+        # NaN comparisons are False, so warmup bars stay hold
+        buy = (fast[1:] > slow[1:]) & (fast[:-1] < slow[:-1])
+        sell = (fast[1:] < slow[1:]) & (fast[:-1] > slow[:-1])
+        signals[1:][buy] = BUY
+        signals[1:][sell] = SELL
+        return signals
+
+    def compute_signals(self, bars: pd.DataFrame, start: int = 0) -> np.ndarray:
+        """ Whole-series signals via vectorized_signals(); bars before `start` are HOLD. """
+        signals = self.vectorized_signals(
+            self._closes(bars), self.short_window, self.long_window
+        )
+        signals[:start] = HOLD
+        return signals
+
+    def execute_trade(self, signal: int):
+        print(f"{self.symbol}: Simple SMA signal = {signal_name(signal)}")
\ No newline at end of file
@@ -1,47 +1,192 @@
-from typing import List
+from typing import Any, Dict, List, Tuple, Union
+import numpy as np
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, HOLD, BUY, signal_name
+from src.strategies._kernels import sma_cross, bollinger_last, rsi_last, macd_cross
+from src.strategies.simple_sma import SimpleSMA
+from src.strategies.mean_reversion_strategy import MeanReversionStrategy
+from src.strategies.rsi_strategy import RSIStrategy
+from src.strategies.macd_strategy import MACDStrategy
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def _sma_code(close: np.ndarray, short_window: int = 5, long_window: int = 20) -> int:
+    return sma_cross(close, short_window, long_window)
+
+def _mean_reversion_code(close: np.ndarray, lookback: int = 20, threshold: float = 1.5) -> int:
+    if len(close) < lookback:
+        return HOLD
+    price, lower_band, upper_band = bollinger_last(close, lookback, threshold)
+    if price < lower_band:
+        return BUY
+    if price > upper_band:
+        return SELL
+    return HOLD
+
+def _rsi_code(close: np.ndarray, period: int = 14, overbought: int = 70, oversold: int = 30) -> int:
+    if len(close) < period + 1:
+        return HOLD
+    latest_rsi = rsi_last(close, period)
+    if latest_rsi < oversold:
+        return BUY
+    if latest_rsi > overbought:
+        return SELL
+    return HOLD
+
+def _macd_code(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> int:
+    if len(close) < slow + signal:
+        return HOLD
+    return macd_cross(close, fast, slow, signal)
+
+# Member kind -> kernel wrapper returning the SELL / HOLD / BUY signal for the last bar of `close`
+_KERNELS = {
+    "sma": _sma_code,
+    "mean_reversion": _mean_reversion_code,
+    "rsi": _rsi_code,
+    "macd": _macd_code,
+}
+
+# Member kind -> whole-series SELL / HOLD / BUY signal codes
+_VECTORIZED = {
+    "sma": SimpleSMA.vectorized_signals,
+    "mean_reversion": MeanReversionStrategy.vectorized_signals,
+    "rsi": RSIStrategy.vectorized_signals,
+    "macd": MACDStrategy.vectorized_signals,
+}
+
+def _member_spec(strat: BaseStrategy) -> Tuple[Any, Dict[str, Any]]:
+    """ Map a built-in strategy instance to its (kind, params) kernel spec. """
+    if isinstance(strat, SimpleSMA):
+        return "sma", {"short_window": strat.short_window, "long_window": strat.long_window}
+    if isinstance(strat, MeanReversionStrategy):
+        return "mean_reversion", {"lookback": strat.lookback, "threshold": strat.threshold}
+    if isinstance(strat, RSIStrategy):
+        return "rsi", {"period": strat.period, "overbought": strat.overbought, "oversold": strat.oversold}
+    if isinstance(strat, MACDStrategy):
+        return "macd", {"fast": strat.fast, "slow": strat.slow, "signal": strat.signal}
+    # Other strategies are asked for their signal directly
+    return None, {}
 
 class StrategyEnsemble(BaseStrategy):
     """
     Combines multiple strategies and generates a single consensus signal.
     Static inclusion: all strategies participate equally.
+
+    Members are strategy instances or (kind, params) tuples, where kind is one of
+    "sma", "mean_reversion", "rsi" or "macd" and params are that strategy's
+    keyword arguments, e.g. ("rsi", {"period": 10}). Built-in members are
+    evaluated by calling their kernels on one shared close array.
     """
 
-    def __init__(self, broker, symbol, strategies: List[BaseStrategy] = None, min_votes: int = 2, verbose: bool = False):
+    def __init__(
+            self,
+            broker,
+            symbol,
+            strategies: List[Union[BaseStrategy, Tuple[str, Dict[str, Any]]]] = None,
+            min_votes: int = 2,
+            verbose: bool = False,
+    ):
         super().__init__(broker, symbol)
         self.strategies = strategies
         self.verbose = verbose
         self.min_votes = min_votes
+
+        # (name, kind or None, params, strategy or None) per member, resolved once
+        self._members = []
+        for member in strategies or []:
+            if isinstance(member, BaseStrategy):
+                kind, params = _member_spec(member)
+                name, strat = member.__class__.__name__, member
+            else:
+                kind, params = member
+                params = dict(params or {})
+                if kind not in _KERNELS:
+                    raise ValueError(f"Unknown ensemble member kind: {kind!r}")
+                name, strat = kind, None
+            self._members.append((name, kind, params, strat))
+        self._codes = np.empty(len(self._members), dtype = np.int8)
     
     def evaluate_signal(self, bars):
         """
-        Call evaluate_signal() on each strategy and combine their votes.
+        Evaluate every member on the same bars and combine their votes.
         Static inclusion: equal weight for all strategies.
         """
-        signals = []
-        for strat in self.strategies:
+        close = self._closes(bars)
+        return self._vote(self._member_codes(close, bars))
+    
+    def evaluate_signal_at(self, closes: np.ndarray, i: int) -> int:
+        """
+        Index-based variant used by the BacktestEngine.
+        Each member gets the same shared close array (no per-strategy slicing).
+        """
+        return self._vote(self._member_codes(closes[: i + 1], None, closes, i))
+
+    def compute_signals(self, bars, start: int = 0) -> np.ndarray:
+        """
+        Consensus signals for the whole series in one pass per member.
+
+        Each member's signal series fills one column of an (N, members) int8
+        vote matrix; buy and sell votes are then counted across each row
+        instead of voting bar by bar.
+        """
+        close = self._closes(bars)
+        votes = np.zeros((len(close), len(self._members)), dtype = np.int8)
+        for k, (name, kind, params, strat) in enumerate(self._members):
             try:
-                sig = strat.evaluate_signal(bars)
-                signals.append(sig)
+                if kind is not None:
+                    votes[:, k] = _VECTORIZED[kind](close, **params)
+                else:
+                    votes[:, k] = strat.compute_signals(bars, start)
             except Exception as e:
-                if self.verbose:
-                    print(f"[WARN] {strat.__class__.__name__} signal fialed: {e}")
-                signals.append("hold")
-        
-        buy_votes = signals.count("buy")
-        sell_votes = signals.count("sell")
+                log.warning("%s signal failed: %s", name, e)
+
+        buy_votes = (votes == BUY).sum(axis = 1)
+        sell_votes = (votes == SELL).sum(axis = 1)
+
+        signals = np.full(len(close), HOLD, dtype = np.int8)
+        signals[(buy_votes >= self.min_votes) & (buy_votes > sell_votes)] = BUY
+        signals[(sell_votes >= self.min_votes) & (sell_votes > buy_votes)] = SELL
+        signals[:start] = HOLD
+        return signals
+
+    def _member_codes(self, close: np.ndarray, bars = None, closes = None, i: int = -1) -> np.ndarray:
+        """
+        Fill the preallocated member code array for the last bar of `close`.
+        Members without a kernel fall back to their own evaluate_signal(bars),
+        or evaluate_signal_at(closes, i) when called from a backtest.
+        """
+        codes = self._codes
+        for k, (name, kind, params, strat) in enumerate(self._members):
+            try:
+                if kind is not None:
+                    codes[k] = _KERNELS[kind](close, **params)
+                elif closes is not None:
+                    codes[k] = strat.evaluate_signal_at(closes, i)
+                else:
+                    codes[k] = strat.evaluate_signal(bars)
+            except Exception as e:
+                log.warning("%s signal failed: %s", name, e)
+                codes[k] = HOLD
+        return codes
+    
+    def _vote(self, codes: np.ndarray) -> int:
+        """ Combine member codes using the min_votes quorum """
+        # Shift SELL / HOLD / BUY to bins 0 / 1 / 2
+        sell_votes, hold_votes, buy_votes = np.bincount(codes - SELL, minlength = 3)[:3]
 
         if buy_votes >= self.min_votes and buy_votes > sell_votes:
-            decision = "buy"
+            decision = BUY
         elif sell_votes >= self.min_votes and sell_votes > buy_votes:
-            decision = "sell"
+            decision = SELL
         else:
-            decision = "hold"
+            decision = HOLD
         
         if self.verbose:
-            print(f"[ENSEMBLE] buy={buy_votes}, sell={sell_votes}, hold={signals.count('hold')} -> {decision}")
+            print(f"[ENSEMBLE] buy={buy_votes}, sell={sell_votes}, hold={hold_votes} -> {signal_name(decision)}")
         
         return decision
     
-    def execute_trade(self, signal: str):
-        print(f"{self.symbol}: STRATEGY ENSEMBLE signal = {signal}")
\ No newline at end of file
+    def execute_trade(self, signal: int):
+        print(f"{self.symbol}: STRATEGY ENSEMBLE signal = {signal_name(signal)}")
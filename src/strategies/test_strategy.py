@@ -1,5 +1,7 @@
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.signal import SELL, HOLD, BUY, signal_name
 from src.data.base_data_provider import BaseDataProvider
+import numpy as np
 import pandas as pd
 
 class TestStrategy(BaseStrategy):
@@ -9,26 +11,38 @@ class TestStrategy(BaseStrategy):
     Used to validate TradingEngine pipeline without waiting for real market signals. Cycles through: Buy -> Hold -> Sell -> Hold
     """
 
-    def __init__(self, broker, symbol, data_provider: BaseDataProvider):
+    # Four-step cycle, so the position wraps with `& 3` instead of a modulo
+    _CYCLE = (BUY, HOLD, SELL, HOLD)
+
+    def __init__(self, broker, symbol, data_provider: BaseDataProvider, verbose: bool = False):
         super().__init__(broker, symbol)
         self.data = data_provider
         self.call_count = 0
+        self.verbose = verbose
+        self._phase = 0
     
-    def evaluate_signal(self, bars: pd.DataFrame = None) -> str:
+    def evaluate_signal(self, bars: pd.DataFrame = None) -> int:
         """
         Generate signals in a predicatable pattern for testing
 
         Cycle: BUY (1x) -> HOLD(1x) -> SELL(1x) -> HOLD(1x) -> repeat
         """
-        signals = ['buy', 'hold', 'sell', 'hold']
-        signal = signals[self.call_count % len(signals)]
+        signal = self._CYCLE[self._phase]
+        self._phase = (self._phase + 1) & 3
         self.call_count += 1
 
-        print(f"TestStrategy call #{self.call_count}: returning '{signal}'")
+        if self.verbose:
+            print(f"TestStrategy call #{self.call_count}: returning '{signal_name(signal)}'")
         return signal
+
+    def evaluate_signal_at(self, closes: np.ndarray, i: int) -> int:
+        """ The cycle ignores prices, so skip wrapping closes in a DataFrame. """
+        return self.evaluate_signal()
+
+    def run_once(self):
+        """ Advance the cycle; execute_trade() is a no-op so it isn't dispatched. """
+        self.evaluate_signal()
     
-    def execute_trade(self, signal: str):
+    def execute_trade(self, signal: int):
         """ Not used by TradingEngine but required by BaseStrategy """
         pass
-
-
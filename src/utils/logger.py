@@ -0,0 +1,95 @@
+import atexit
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, TextIO, Tuple
+
+_listener: Optional[QueueListener] = None
+
+
+class RateLimitingFilter(logging.Filter):
+    """
+    Suppress repeats of the same warning/error within a time window.
+
+    Records are grouped by logger, source line, unformatted message template and
+    exception type, so messages that differ only in their arguments (prices,
+    order ids, timestamps) count as repeats. The first record of a group is
+    emitted, repeats within `interval` seconds are dropped, and the next record
+    emitted after the window reports how many were suppressed. During an API
+    outage this turns a traceback per cycle into one traceback per window.
+    Records below `level` always pass.
+    """
+
+    def __init__(self, interval: float = 10.0, level: int = logging.WARNING):
+        super().__init__()
+        self.interval = interval
+        self.level = level
+        # key -> (monotonic time last emitted, repeats suppressed since)
+        self._seen: Dict[Tuple, Tuple[float, int]] = {}
+        self._next_sweep = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+
+        exc_type = record.exc_info[0] if record.exc_info else None
+        key = (record.name, record.lineno, record.msg, exc_type)
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        last, suppressed = self._seen.get(key, (float("-inf"), 0))
+        if now - last < self.interval:
+            self._seen[key] = (last, suppressed + 1)
+            return False
+
+        self._seen[key] = (now, 0)
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar suppressed)"
+            record.args = None
+        return True
+
+    def _sweep(self, now: float) -> None:
+        """ Drop groups whose window has expired with nothing suppressed (once per interval). """
+        self._seen = {
+            key: entry for key, entry in self._seen.items()
+            if entry[1] or now - entry[0] < self.interval
+        }
+        self._next_sweep = now + self.interval
+
+
+def get_logger(name: str, interval: float = 10.0) -> logging.Logger:
+    """ Return the named logger with a RateLimitingFilter attached (once). """
+    log = logging.getLogger(name)
+    if not any(isinstance(f, RateLimitingFilter) for f in log.filters):
+        log.addFilter(RateLimitingFilter(interval))
+    return log
+
+
+def configure_logging(level: int = logging.INFO, stream: Optional[TextIO] = None) -> None:
+    """
+    Send log records to `stream` (stdout by default) from a background thread.
+
+    The root logger gets a QueueHandler, so logging calls on the trading path
+    only enqueue the record; a QueueListener formats and writes it. Messages are
+    printed bare, as the print-based output was. Does nothing when the root
+    logger already has handlers, so an application's own setup wins.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level = True)
+    _listener.start()
+    # Drain queued records on interpreter exit
+    atexit.register(_listener.stop)
@@ -8,6 +8,7 @@ from src.strategies import simple_sma, rsi_strategy, macd_strategy, mean_reversi
 from src.strategies.strategy_ensemble import StrategyEnsemble
 from src.data.stock_data_provider import StockDataProvider
 from src.data.crypto_data_provider import CryptoDataProvider
+from src.data.cached_data_provider import CachedDataProvider
 from src.brokers.alpaca_broker import AlpacaBroker
 import pandas as pd
 
@@ -22,8 +23,9 @@ stocks = ["AAPL", "UNH", "TSLA"]
 cryptos = ["BTC/USD", "ETH/USD", "XRP/USD"]
 
 broker = AlpacaBroker()
-stock_data = StockDataProvider(broker.client.api_key, broker.client.secret_key)
-crypto_data = CryptoDataProvider(broker.client.api_key, broker.client.secret_key)
+# Bars are cached on disk so re-running the script skips the API round-trips
+stock_data = CachedDataProvider(StockDataProvider(broker.client.api_key, broker.client.secret_key))
+crypto_data = CachedDataProvider(CryptoDataProvider(broker.client.api_key, broker.client.secret_key))
 results = []
 
 for name, cls in strategies.items():
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pytest
+
+@pytest.fixture(scope = "session", autouse = True)
+def _warm_numba():
+    """
+    Compile (or load from the on-disk cache) every numba kernel once per session,
+    before any test starts its engine or timer.
+
+    The strategy kernels declare their signatures and compile when
+    src.strategies is imported; the portfolio and backtest kernels compile
+    lazily, so each is called once with tiny inputs of the production types.
+    """
+    import src.strategies
+    from src.portfolio._kernels import compute_position_params
+    from src.backtesting._kernels import run_backtest
+
+    compute_position_params(10_000.0, 100.0, 0.02, 0.05, 0.95, 1.10, 100.0)
+    run_backtest(np.full(25, 100.0), np.zeros(25, dtype = np.int8), 20, 10_000.0, 0.02, 0.0005, 0.0, 0.0)
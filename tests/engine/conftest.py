@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from src.brokers.alpaca_broker import AlpacaBroker
+from src.data.stock_data_provider import StockDataProvider
+from src.data.crypto_data_provider import CryptoDataProvider
+
+# Built once per test module, so credentials and TLS sessions are shared by its tests
+
+@pytest.fixture(scope = "module")
+def broker():
+    return AlpacaBroker()
+
+@pytest.fixture(scope = "module")
+def stock_data(broker):
+    return StockDataProvider(broker.client.api_key, broker.client.secret_key)
+
+@pytest.fixture(scope = "module")
+def crypto_data(broker):
+    return CryptoDataProvider(broker.client.api_key, broker.client.secret_key)
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from datetime import datetime
+from src.engine import TradingEngine
+from src.strategies.test_strategy import TestStrategy
+
+RULE = "=" * 60
+
+def test_print_status_output(tmp_path, capsys):
+    """ print_status writes the same layout the line-by-line prints used to """
+    engine = TradingEngine(
+        broker = None,
+        data_provider_stock = None,
+        data_provider_crypto = None,
+        log_dir = str(tmp_path)
+    )
+    try:
+        engine.add_strategy("AAPL", TestStrategy(None, "AAPL", None), None, None, 300, "stock")
+        engine.strategies["AAPL_stock"].last_run = datetime(2024, 1, 2, 3, 4, 5)
+        capsys.readouterr()
+
+        engine.print_status()
+
+        assert capsys.readouterr().out == (
+            f"\n{RULE}\nTRADING ENGINE STATUS\n{RULE}\n"
+            "Running: False\n"
+            "Strategies: 1\n"
+            "\n  AAPL_stock:\n"
+            "    Asset Type: stock\n"
+            "    Interval: 300s\n"
+            "    Last Run: 2024-01-02T03:04:05\n"
+            "    Trades: 0\n"
+            f"{RULE}\n\n"
+        )
+    finally:
+        engine.logger.close()
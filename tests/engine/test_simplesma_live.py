@@ -14,12 +14,16 @@ from src.data.crypto_data_provider import CryptoDataProvider
 from src.data.stock_data_provider import StockDataProvider
 from src.portfolio.risk_config import RiskConfig
 from src.portfolio.position_manager import PositionManager
+from src.utils.logger import configure_logging
 
 CRYPTO_SYMBOLS = ["BTC/USD", "ETH/USD", "XRP/USD"]
 STOCK_SYMBOLS = ["AAPL", "UNH", "TSLA"]
 
 INTERVAL = 300
 
+# Print engine logs to stdout (off the trading threads)
+configure_logging()
+
 broker = AlpacaBroker()
 crypto_data = CryptoDataProvider(api_key = broker.client.api_key, secret_key = broker.client.secret_key)
 stock_data = StockDataProvider(api_key = broker.client.api_key, secret_key = broker.client.secret_key)
@@ -5,8 +5,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-import time
+import asyncio
+import os
+import signal
+import pytest
 from datetime import datetime
+from threading import Thread
 from src.brokers.alpaca_broker import AlpacaBroker
 from src.data.stock_data_provider import StockDataProvider
 from src.data.crypto_data_provider import CryptoDataProvider
@@ -15,131 +19,141 @@ from src.strategies.test_strategy import TestStrategy
 from src.portfolio.risk_config import RiskConfig
 from src.portfolio.position_manager import PositionManager
 from src.engine import TradingEngine
+from src.utils.logger import configure_logging
 
-def test_engine_stock_and_crypto():
-    """ Test engine with one stock strategy and one crypto strategy """
-    broker = AlpacaBroker()
-    stock_data = StockDataProvider(broker.client.api_key, broker.client.secret_key)
-    crypto_data = CryptoDataProvider(broker.client.api_key, broker.client.secret_key)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
-    engine = TradingEngine(
-        broker = broker,
-        data_provider_stock = stock_data,
-        data_provider_crypto = crypto_data,
-        log_dir = "logs"
-    )
+# Seconds between engine status prints while a test runs
+STATUS_INTERVAL = 30
+# Worker threads are pinned to the first two CPUs available to the test run (Linux only)
+WORKER_CPUS = set(sorted(os.sched_getaffinity(0))[:2]) if hasattr(os, "sched_getaffinity") else None
 
-    # Strategy 1: Stock (AAPL)
-    risk_config_1 = RiskConfig(
-        risk_per_trade = 0.02,
-        stop_loss_pct = 0.05,
-        take_profit_pct = 0.10,
-        max_position_size = 10
-    )
-    position_mgr_1 = PositionManager(risk_config_1)
-    strategy_1 = SimpleSMA(
-        symbol = "AAPL",
-        broker = broker,
-        data_provider = stock_data,
-        short_window = 5,
-        long_window = 20
-    )
-    engine.add_strategy(
-        symbol = "AAPL",
-        strategy = strategy_1,
-        risk_config = risk_config_1,
-        position_manager = position_mgr_1,
-        interval_seconds = 300,
-        asset_type = "stock"
-    )
+def _notify_on_exit(thread: Thread, loop: asyncio.AbstractEventLoop, event: asyncio.Event):
+    """ Set `event` on `loop` as soon as `thread` exits. """
+    def watch():
+        thread.join()
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # The driver already finished and closed its loop
+    Thread(target = watch, daemon = True).start()
+
+async def _run(engine: TradingEngine, duration: float, interval: float):
+    """
+    Print engine status every `interval` seconds until `duration` seconds have
+    passed, CTRL + C is pressed, or the engine thread exits. The coroutine
+    sleeps on one event between prints instead of waking every second to poll.
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+    except (NotImplementedError, RuntimeError):
+        # No loop signal handlers (Windows / non-main thread): CTRL + C raises KeyboardInterrupt
+        pass
+    _notify_on_exit(engine.engine_thread, loop, stop)
+
+    deadline = loop.time() + duration
+    while True:
+        engine.print_status()
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            await asyncio.wait_for(stop.wait(), timeout = min(interval, remaining))
+        except asyncio.TimeoutError:
+            continue
+        if engine.engine_thread.is_alive():
+            print("\nShutting down...")
+        else:
+            print("\nEngine thread exited, shutting down...")
+        break
+
+def _run_engine(engine: TradingEngine, duration: float, interval: float = STATUS_INTERVAL):
+    """ Drive a started engine for `duration` seconds (on uvloop when installed), then stop it. """
+    run = uvloop.run if uvloop is not None else asyncio.run
+    try:
+        run(_run(engine, duration, interval))
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        engine.stop()
+        engine.print_status()
 
-    risk_config_2 = RiskConfig(
+def _risk_config(max_position_size: float) -> RiskConfig:
+    """ Risk settings shared by every case; only the position cap differs """
+    return RiskConfig(
         risk_per_trade = 0.02,
         stop_loss_pct = 0.05,
         take_profit_pct = 0.10,
-        max_position_size = 0.1
+        max_position_size = max_position_size
     )
-    position_mgr_2 = PositionManager(risk_config_2)
-    strategy_2 = SimpleSMA(
-        symbol = "XRP/USD",
+
+def _sma(broker, symbol, data_provider):
+    return SimpleSMA(
+        symbol = symbol,
         broker = broker,
-        data_provider = crypto_data,
+        data_provider = data_provider,
         short_window = 5,
         long_window = 20
     )
-    engine.add_strategy(
-        symbol = "XRP/USD",
-        strategy = strategy_2,
-        risk_config = risk_config_2,
-        position_manager = position_mgr_2,
-        interval_seconds = 300,
-        asset_type = "crypto"
-    )
-
-    engine.start()
 
-    print("Engine running... Press CTRL + C to stop")
-    try:
-        for i in range(300):
-            time.sleep(1)
-            if i % 30 == 0:
-                engine.print_status()
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-    finally:
-        engine.stop()
-        engine.print_status()
+def _test_strategy(broker, symbol, data_provider):
+    return TestStrategy(broker = broker, symbol = symbol, data_provider = data_provider, verbose = True)
 
-def test_engine_with_test_strategy():
-    """ Validate engine pipeline with predicatable signals """
-    broker = AlpacaBroker()
-    stock_data = StockDataProvider(broker.client.api_key, broker.client.secret_key)
-    crypto_data = CryptoDataProvider(broker.client.api_key, broker.client.secret_key)
+# (symbol, asset_type, strategy_factory, risk_config, interval_seconds)
+STOCK_CRYPTO_CASES = [
+    ("AAPL", "stock", _sma, _risk_config(10), 300),
+    ("XRP/USD", "crypto", _sma, _risk_config(0.1), 300),
+]
+# ETH/USD only, checked every 10 seconds (faster feedback)
+TEST_STRATEGY_CASES = [
+    ("ETH/USD", "crypto", _test_strategy, _risk_config(5), 10),
+]
 
+@pytest.mark.parametrize(
+    "cases,duration,status_interval",
+    [
+        # One stock strategy and one crypto strategy
+        (STOCK_CRYPTO_CASES, 300, STATUS_INTERVAL),
+        # Engine pipeline with predictable signals: 2 minutes, status at the strategy's 10s cadence
+        (TEST_STRATEGY_CASES, 120, 10),
+    ],
+    ids = ["stock_and_crypto", "test_strategy"],
+)
+def test_engine(cases, duration, status_interval, broker, stock_data, crypto_data):
+    """ Run the engine over `cases` for `duration` seconds """
     engine = TradingEngine(
-        broker = broker, 
+        broker = broker,
         data_provider_stock = stock_data,
         data_provider_crypto = crypto_data,
         log_dir = "logs"
     )
 
-    # Test with XRP/USD only (faster feedback)
-    risk_config = RiskConfig(
-        risk_per_trade=0.02,
-        stop_loss_pct=0.05,
-        take_profit_pct=0.10,
-        max_position_size=5
-    )
-    position_mgr = PositionManager(risk_config)
-    
-    strategy = TestStrategy(
-        broker=broker,
-        symbol="ETH/USD",
-        data_provider=crypto_data
-    )
-    
-    engine.add_strategy(
-        symbol="ETH/USD",
-        strategy=strategy,
-        risk_config=risk_config,
-        position_manager=position_mgr,
-        interval_seconds=10,  # Check every 10 seconds
-        asset_type="crypto"
-    )
+    for symbol, asset_type, strategy_factory, risk_config, interval_seconds in cases:
+        data_provider = stock_data if asset_type == "stock" else crypto_data
+        engine.add_strategy(
+            symbol = symbol,
+            strategy = strategy_factory(broker, symbol, data_provider),
+            risk_config = risk_config,
+            position_manager = PositionManager(risk_config),
+            interval_seconds = interval_seconds,
+            asset_type = asset_type
+        )
 
+    if WORKER_CPUS:
+        engine.set_worker_affinity(WORKER_CPUS)
     engine.start()
 
-    print("Engine running with TestStrategy... Press CTRL + C to stop")
-    try:
-        for i in range(120):  # Run for 2 minutes
-            time.sleep(1)
-            if i % 30 == 0:
-                engine.print_status()
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-    finally:
-        engine.stop()
-        engine.print_status()
+    print("Engine running... Press CTRL + C to stop")
+    _run_engine(engine, duration, status_interval)
 
 if __name__ == "__main__":
-    test_engine_with_test_strategy()
\ No newline at end of file
+    configure_logging()
+    broker = AlpacaBroker()
+    stock_data = StockDataProvider(broker.client.api_key, broker.client.secret_key)
+    crypto_data = CryptoDataProvider(broker.client.api_key, broker.client.secret_key)
+    test_engine(TEST_STRATEGY_CASES, 120, 10, broker, stock_data, crypto_data)
\ No newline at end of file
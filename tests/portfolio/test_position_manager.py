@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.portfolio.position_manager import PositionManager
+from src.portfolio.risk_config import RiskConfig
+
+def test_fractional_cap_is_not_truncated():
+    """ A fractional max_position_size (crypto) caps the size instead of rounding it to zero """
+    manager = PositionManager(RiskConfig(max_position_size = 0.1))
+    assert manager.calculate_position_size(100_000.0, 2.0) == 0.1
+
+def test_size_is_whole_units_below_cap():
+    """ Below the cap the risk formula is truncated to whole units """
+    manager = PositionManager(RiskConfig(max_position_size = 100))
+    # 10_000 * 0.02 / (30 * 0.05) = 133.3 -> capped at 100; 1_000 * 0.02 / 1.5 = 13.3 -> 13
+    assert manager.calculate_position_size(10_000.0, 30.0) == 100
+    assert manager.calculate_position_size(1_000.0, 30.0) == 13
+    assert manager.calculate_position_size(1_000.0, 0.0) == 0
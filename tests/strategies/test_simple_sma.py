@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+from src.strategies._kernels import sma_cross
+from src.strategies.simple_sma import SimpleSMA
+
+def _pandas_crossover(close: np.ndarray, short_window: int, long_window: int) -> int:
+    """ Pre-kernel reference: rolling means on a DataFrame, compared on the last two rows """
+    df = pd.DataFrame({"close": close})
+    df["sma_short"] = df["close"].rolling(short_window).mean()
+    df["sma_long"] = df["close"].rolling(long_window).mean()
+    if len(df) < long_window + 1:
+        return 0
+    prev, recent = df.iloc[-2], df.iloc[-1]
+    if prev.sma_short < prev.sma_long and recent.sma_short > recent.sma_long:
+        return 1
+    if prev.sma_short > prev.sma_long and recent.sma_short < recent.sma_long:
+        return -1
+    return 0
+
+def test_sma_cross_matches_pandas():
+    """ The compiled crossover agrees with the rolling-mean path on every bar of a random walk """
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    for short_window, long_window in [(5, 20), (3, 7), (10, 50)]:
+        for i in range(len(close)):
+            window = close[: i + 1]
+            assert sma_cross(window, short_window, long_window) == _pandas_crossover(window, short_window, long_window)
+
+def test_vectorized_signals_match_kernel():
+    """ Whole-series signals agree with the per-bar kernel """
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    signals = SimpleSMA.vectorized_signals(close, 5, 20)
+    expected = [sma_cross(close[: i + 1], 5, 20) for i in range(len(close))]
+    np.testing.assert_array_equal(signals, expected)
+
+def test_evaluate_signal_at_matches_kernel():
+    """ The streamed per-bar path agrees with the kernel, bar by bar and at random bars """
+    rng = np.random.default_rng(2)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400))
+    strategy = SimpleSMA(None, "TEST", None, short_window = 5, long_window = 20)
+    expected = [sma_cross(close[: i + 1], 5, 20) for i in range(len(close))]
+    assert [strategy.evaluate_signal_at(close, i) for i in range(len(close))] == expected
+    for i in rng.integers(0, len(close), 50):
+        assert strategy.evaluate_signal_at(close, i) == expected[i]
+
+def test_live_stream_matches_kernel():
+    """ Live ticks through the incremental state agree with the kernel on the same history """
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, 120))
+    bars = pd.DataFrame({"close": close}, index = pd.date_range("2024-01-01", periods = len(close), freq = "D"))
+
+    class _Provider:
+        def __init__(self):
+            self.n = 0
+        def get_bars(self, symbol, timeframe, limit = 100):
+            return bars.iloc[: self.n].tail(limit)
+
+    provider = _Provider()
+    strategy = SimpleSMA(None, "TEST", provider, short_window = 5, long_window = 20)
+    for n in range(1, len(close) + 1):
+        provider.n = n
+        assert strategy.evaluate_signal() == sma_cross(close[:n], 5, 20)